@@ -0,0 +1,116 @@
+"""Batch generation of the CWE ontology for many CWE List releases.
+
+The batch takes a directory of CWE List releases "cwec_v<version>.xml" (also .xml.zip, .xml.gz or .xml.zst)
+and generates the ontology of every release as "results/<version>/cwe.ttl" in parallel worker processes. Every worker imports the generator and compiles every CWE schema once and reuses them for all its releases.
+A release is validated against the schema named by its xsi:schemaLocation when that file, e.g. "cwe_schema_v6.10.xsd", is in the directory of the releases,
+otherwise against the schema of the batch. A release that cannot be read, parsed or generated is reported as an error of its version.
+A release is skipped when its output is newer than the release, "shell.ttl" and the schema and it was generated with the same sections,
+which are recorded next to the output in "results/<version>/cwe.ttl.sections".
+"""
+
+import argparse, contextlib, io, os, re
+from datetime import datetime
+from multiprocessing import Pool
+
+release = re.compile(r"^cwec_v(.+?)\.xml(\.zip|\.gz|\.zst)?$")
+xsd_fn = "data/cwe_schema_latest.xsd"
+
+XSI = "{http://www.w3.org/2001/XMLSchema-instance}"
+
+_xsd = None
+_schemas = dict()
+
+def _initWorker(xsd):
+        global _xsd
+        _xsd = xsd
+
+def _schema(fn, root):
+        """Returns the compiled schema of the release: the schema of its xsi:schemaLocation in the directory of the release or the schema of the batch."""
+        import lxml.etree
+        xsd = _xsd
+        location = root.attrib.get(XSI + "schemaLocation", "").split()
+        if location:
+                local = os.path.join(os.path.dirname(fn), os.path.basename(location[-1]))
+                if os.path.exists(local): xsd = local
+        if xsd not in _schemas: _schemas[xsd] = lxml.etree.XMLSchema(file=xsd)
+        return _schemas[xsd]
+
+def _versionKey(version):
+        return [int(n) if n.isdigit() else n for n in re.split(r"[.\-]", version)]
+
+def releases(path):
+        """Returns the sorted list of (version, file name) of the CWE List releases in the directory."""
+        r = list()
+        for name in os.listdir(path):
+                m = release.match(name)
+                if m is not None: r.append((m.group(1), os.path.join(path, name)))
+        return sorted(r, key = lambda t: _versionKey(t[0]))
+
+def stamp(sections):
+        return "\n".join(sorted(sections)) + "\n"
+
+def upToDate(fn, dependencies, sections = None):
+        if not os.path.exists(fn): return False
+        if sections is not None:
+                if not os.path.exists(fn + ".sections"): return False
+                with open(fn + ".sections", mode='r', encoding='utf-8') as in_file:
+                        if in_file.read() != stamp(sections): return False
+        t = os.path.getmtime(fn)
+        return all(os.path.getmtime(d) <= t for d in dependencies if d is not None and os.path.exists(d))
+
+def _generateRelease(task):
+        version, fn, out_fn, sections = task
+        import generateCWEontology as generator
+        try:
+                if _xsd is not None:
+                        import lxml.etree
+                        with generator.openCatalog(fn) as in_file:
+                                xml_file = lxml.etree.parse(in_file)
+                        schema = _schema(fn, xml_file.getroot())
+                        if not schema.validate(xml_file): return (version, str(schema.error_log))
+                        xml_file = None
+                generator.xml_fn = fn
+                with contextlib.redirect_stdout(io.StringIO()):
+                        generator.generateIndividuals(generator.parseXML(), sections, out_fn)
+                with open(out_fn + ".sections", mode='w', encoding='utf-8') as out_file:
+                        out_file.write(stamp(sections))
+        except Exception as exc:
+                return (version, f"{type(exc).__name__}: {exc}")
+        return (version, None)
+
+def generateBatch(path, processes = None, xsd = xsd_fn, sections = None, force = False, results = "results"):
+        """Generates the ontology of every release in the directory and returns a dictionary version -> error log of the invalid releases."""
+        import generateCWEontology as generator
+        if sections is None: sections = generator.profiles["full"]
+        tasks = list()
+        for version, fn in releases(path):
+                out_fn = os.path.join(results, version, "cwe.ttl")
+                if not force and upToDate(out_fn, [fn, "shell.ttl", xsd], sections):
+                        print(version + ": up to date")
+                        continue
+                tasks.append((version, fn, out_fn, sections))
+        errors = dict()
+        if not tasks: return errors
+        with Pool(min(processes or os.cpu_count(), len(tasks)), initializer=_initWorker, initargs=(xsd,)) as pool:
+                for version, error_log in pool.imap_unordered(_generateRelease, tasks):
+                        if error_log is None:
+                                print(version + ": generated")
+                        else:
+                                print(version + ": CWE List contents is not valid or cannot be generated!")
+                                print(error_log)
+                                errors[version] = error_log
+        return errors
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('directory', help='directory of the CWE List releases cwec_v<version>.xml')
+        parser.add_argument('-p', '--processes', type=int, help='number of worker processes')
+        parser.add_argument('-x', '--xsd', default=xsd_fn, help='CWE schema file')
+        parser.add_argument('-n', '--no-validate', action="store_true", help='do not validate the releases')
+        parser.add_argument('-P', '--profile', default="full", choices=["core", "full"], help='output profile: the sections of the entries to generate')
+        parser.add_argument('-f', '--force', action="store_true", help='regenerate the releases with current outputs')
+        args = parser.parse_args()
+        start = datetime.now()
+        generateBatch(args.directory, args.processes, None if args.no_validate else args.xsd, generator.profiles[args.profile], args.force)
+        print(f"Elapsed: {datetime.now() - start}")
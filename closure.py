@@ -0,0 +1,126 @@
+"""Transitive closure of the CWE view hierarchies.
+
+The generator emits only the direct ChildOf, Member_Of, CanPrecede and Requires relationships of every view and their inverses.
+This stage computes per view the transitive closure of these relationship families with compact integer ID adjacency arrays.
+The closure is written as triples "results/closure.ttl" or as a side index "results/closure.json" with the ancestors and descendants of every entry,
+so consumers that need only the hierarchy can skip the reasoner run.
+"""
+
+import argparse, json, os
+from array import array
+from datetime import datetime
+from generateCWEontology import view_property
+
+families = {"ChildOf":"ParentOf", "Member_Of":"Has_Member", "CanPrecede":"CanFollow", "Requires":"RequiredBy"}
+
+class Graph:
+        """Directed graph of one relationship family within one view stored as compressed sparse rows of integer IDs."""
+        def __init__(self, edges, n):
+                counts = [0] * (n + 1)
+                for s, o in edges:
+                        counts[s + 1] += 1
+                for i in range(n):
+                        counts[i + 1] += counts[i]
+                self.offsets = array('I', counts)
+                self.targets = array('I', bytes(4 * len(edges)))
+                fill = list(counts)
+                for s, o in edges:
+                        self.targets[fill[s]] = o
+                        fill[s] += 1
+
+        def reachable(self, node):
+                seen = set()
+                stack = [node]
+                offsets, targets = self.offsets, self.targets
+                while stack:
+                        v = stack.pop()
+                        for i in range(offsets[v], offsets[v + 1]):
+                                t = targets[i]
+                                if t not in seen:
+                                        seen.add(t)
+                                        stack.append(t)
+                seen.discard(node)
+                return seen
+
+def collectEdges(entries):
+        """Returns a dictionary (view, family) -> set of (entry, ancestor) pairs of the direct relationships."""
+        edges = dict()
+        for e in entries:
+                for s, p, o in e.triples():
+                        m = view_property.match(p)
+                        if m is None: continue
+                        view, nature = m.group(1), m.group(2)
+                        s, o = s.lstrip(":"), o.lstrip(":")
+                        if nature in families:
+                                edges.setdefault((view, nature), set()).add((s, o))
+                        else:
+                                for f, inverse in families.items():
+                                        if nature == inverse:
+                                                edges.setdefault((view, f), set()).add((o, s))
+        return edges
+
+def computeClosure(entries):
+        """Returns a dictionary view -> family -> entry -> (ancestors, descendants)."""
+        closure = dict()
+        for (view, family), pairs in sorted(collectEdges(entries).items()):
+                ids = dict()
+                for s, o in sorted(pairs):
+                        ids.setdefault(s, len(ids))
+                        ids.setdefault(o, len(ids))
+                names = list(ids)
+                up = Graph([(ids[s], ids[o]) for s, o in pairs], len(names))
+                down = Graph([(ids[o], ids[s]) for s, o in pairs], len(names))
+                fd = dict()
+                for name, i in ids.items():
+                        fd[name] = (sorted(names[a] for a in up.reachable(i)), sorted(names[d] for d in down.reachable(i)))
+                closure.setdefault(view, dict())[family] = fd
+        return closure
+
+def writeTurtle(closure, fn):
+        with open(fn, mode='w', encoding='utf-8') as out_file:
+                out_file.write("@prefix : <http://www.semanticweb.org/cwe#> .\n")
+                out_file.write("@prefix owl: <http://www.w3.org/2002/07/owl#> .\n")
+                out_file.write("@prefix rdf: <http://www.w3.org/1999/02/22-rdf-syntax-ns#> .\n")
+                out_file.write("@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .\n")
+                for view in closure:
+                        out_file.write("@prefix cwe-" + view + ": <http://www.semanticweb.org/cwe/cwe-" + view + "#> .\n")
+                for view, fd in closure.items():
+                        prefix = "cwe-" + view + ":"
+                        for family, ed in fd.items():
+                                t = prefix + family + "-Transitive"
+                                out_file.write("\n" + t + " rdf:type owl:ObjectProperty;\n\trdf:type owl:TransitiveProperty;\n\towl:inverseOf " + prefix + families[family] + "-Transitive .")
+                                out_file.write("\n" + prefix + family + " rdfs:subPropertyOf " + t + " .")
+                                for name, (ancestors, descendants) in ed.items():
+                                        if ancestors: out_file.write("\n:" + name + " " + t + " " + ", ".join(":" + a for a in ancestors) + " .")
+                out_file.write("\n")
+
+def writeJSON(closure, fn):
+        index = dict()
+        for view, fd in closure.items():
+                index[view] = dict()
+                for family, ed in fd.items():
+                        index[view][family] = {name: {"ancestors": a, "descendants": d} for name, (a, d) in ed.items()}
+        with open(fn, mode='w', encoding='utf-8') as out_file:
+                json.dump(index, out_file)
+
+def writeClosure(entries, format = "ttl", fn = None):
+        print("Generate closure")
+        closure = computeClosure(entries)
+        if fn is None: fn = "results/closure." + format
+        os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+        if format == "json":
+                writeJSON(closure, fn)
+        else:
+                writeTurtle(closure, fn)
+        return closure
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-f', '--format', default="ttl", choices=["ttl", "json"], help='output format')
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        writeClosure(generator.extractEntries(generator.parseXML()), args.format)
+        print(f"Elapsed: {datetime.now() - start}")
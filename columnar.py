@@ -0,0 +1,88 @@
+"""Columnar export of the CWE weakness attributes.
+
+The export writes the facts the generator extracts from the weaknesses as columnar tables with dictionary encoded categorical columns:
+weaknesses, applicable platforms, modes of introduction, common consequences and taxonomy mappings.
+The tables are written as Parquet files or Arrow IPC files in "results/columnar" from the entity model of the same generation pass.
+The export requires pyarrow.
+"""
+
+import argparse, os
+from datetime import datetime
+from generateCWEontology import uncode, first, platforms
+
+schema = {"weaknesses": ["cwe_id", "name", "abstraction", "structure", "status", "likelihood_of_exploit"],
+        "platforms": ["cwe_id", "kind", "name", "class", "prevalence"],
+        "modes_of_introduction": ["cwe_id", "phase"],
+        "consequences": ["cwe_id", "consequence", "scope", "impact", "likelihood"],
+        "taxonomy_mappings": ["cwe_id", "taxonomy_name", "entry_id", "entry_name", "mapping_fit"]}
+
+def collectColumns(entries):
+        """Returns a dictionary table -> column -> list of values of the weakness entries."""
+        tables = {t: {c: list() for c in cols} for t, cols in schema.items()}
+
+        def append(table, *values):
+                for c, v in zip(schema[table], values):
+                        tables[table][c].append(v)
+
+        for e in entries:
+                if not e.element.tag.endswith("}Weakness"): continue
+                ID = int(e.element.attrib["ID"])
+                a = e.element.attrib
+                append("weaknesses", ID, a["Name"], a["Abstraction"], a["Structure"], a["Status"], first(e.data_facts.get("Likelihood_Of_Exploit", {})))
+                for phase in sorted(e.data_facts.get("Mode_Of_Introduction", {})):
+                        append("modes_of_introduction", ID, uncode(phase))
+                for ind in e.individuals:
+                        facts = ind.data_facts
+                        for t in ind.types:
+                                if t in platforms:
+                                        p = platforms[t]
+                                        append("platforms", ID, t, first(facts.get(p + "Name", ())), first(facts.get(p + "Class", ())), first(facts.get("Prevalence", ())))
+                                elif t == "Consequence":
+                                        for scope in sorted(facts.get("Scope", ())) or [None]:
+                                                for impact in sorted(facts.get("Impact", ())) or [None]:
+                                                        append("consequences", ID, ind.name, scope and uncode(scope), impact and uncode(impact), first(facts.get("Likelihood", ())))
+                                elif t == "Taxonomy_Mapping":
+                                        append("taxonomy_mappings", ID, first(facts.get("Taxonomy_Name", ())), first(facts.get("Entry_ID", ())), first(facts.get("Entry_Name", ())), first(facts.get("Mapping_Fit", ())))
+        return tables
+
+def toTable(columns):
+        import pyarrow as pa
+        arrays = dict()
+        for c, values in columns.items():
+                if c == "cwe_id":
+                        arrays[c] = pa.array(values, type=pa.int32())
+                else:
+                        arrays[c] = pa.array(values, type=pa.string()).dictionary_encode()
+        return pa.table(arrays)
+
+def writeColumnar(entries, format = "parquet", path = "results/columnar"):
+        try:
+                import pyarrow as pa
+        except ImportError:
+                print("The columnar export requires pyarrow.")
+                return None
+        print("Generate columnar tables")
+        os.makedirs(path, exist_ok = True)
+        tables = dict()
+        for name, columns in collectColumns(entries).items():
+                table = toTable(columns)
+                tables[name] = table
+                if format == "parquet":
+                        import pyarrow.parquet as pq
+                        pq.write_table(table, os.path.join(path, name + ".parquet"))
+                else:
+                        with pa.OSFile(os.path.join(path, name + ".arrow"), 'wb') as sink:
+                                with pa.ipc.new_file(sink, table.schema) as writer:
+                                        writer.write_table(table)
+        return tables
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-f', '--format', default="parquet", choices=["parquet", "arrow"], help='output format')
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        writeColumnar(generator.extractEntries(generator.parseXML()), args.format)
+        print(f"Elapsed: {datetime.now() - start}")
@@ -1,6 +1,7 @@
-from language_tags import tags
 import re 
 
+_languages = {"ANY", "NA"}
+
 class CPE:
     
     def __init__(self, part="ANY", vendor="ANY", product="ANY", version="ANY", update="ANY", edition="ANY", language="ANY", \
@@ -11,7 +12,7 @@ class CPE:
         assert _isAvstring(version), "version must be avstring: " + version
         assert _isAvstring(update), "update must be avstring: " + update
         assert _isAvstring(edition), "edition must be avstring: " + edition
-        assert _isAvstring(language) and (language in {"ANY", "NA"} or tags.check(language.replace("\\", ""))), "Bad language value: " + language
+        assert _isAvstring(language) and _isLanguage(language), "Bad language value: " + language
         assert _isAvstring(sw_edition), "sw_edition must be avstring: " + sw_edition
         assert _isAvstring(target_sw), "target_sw must be avstring: " + target_sw
         assert _isAvstring(target_hw), "target_hw must be avstring: " + target_hw
@@ -66,6 +67,15 @@ def _process_quoted_chars(s):
     text = text.replace("\\-", "-")
     return text.replace("\\_", "_")
     
+def _isLanguage(language):
+    #the language tag registry is loaded on the first language other than ANY and NA
+    #the validated languages are cached
+    if language in _languages: return True
+    from language_tags import tags
+    if not tags.check(language.replace("\\", "")): return False
+    _languages.add(language)
+    return True
+
 def _isAvstring(s):
     if not isinstance(s, str): return False
     if s == "ANY" or s == "NA": return True
@@ -0,0 +1,94 @@
+"""SQLite export of the CWE ontology facts.
+
+The export writes the facts of the entity model into a normalized SQLite database "results/cwe.db" for random access lookups:
+the entries, the relationships per view, the taxonomy mappings, the applicable platforms, the common consequences and the potential mitigations.
+The rows are inserted with executemany in a single transaction and the covering indexes of the common lookups are created after the inserts,
+e.g. the parents of a weakness in a view, the entries mapped to a taxonomy entry or the mitigations of a phase.
+"""
+
+import argparse, os, sqlite3
+from datetime import datetime
+from generateCWEontology import uncode, first, platforms, view_property
+
+tables = {"entries": "CREATE TABLE entries (cwe_id INTEGER PRIMARY KEY, kind TEXT NOT NULL, name TEXT, abstraction TEXT, structure TEXT, status TEXT, description TEXT)",
+        "relations": "CREATE TABLE relations (view_id INTEGER NOT NULL, source INTEGER NOT NULL, nature TEXT NOT NULL, target INTEGER NOT NULL, ordinal TEXT, PRIMARY KEY (view_id, source, nature, target)) WITHOUT ROWID",
+        "mappings": "CREATE TABLE mappings (cwe_id INTEGER NOT NULL, taxonomy_name TEXT, entry_id TEXT, entry_name TEXT, mapping_fit TEXT)",
+        "platforms": "CREATE TABLE platforms (cwe_id INTEGER NOT NULL, kind TEXT NOT NULL, name TEXT, class TEXT, prevalence TEXT)",
+        "consequences": "CREATE TABLE consequences (cwe_id INTEGER NOT NULL, scope TEXT, impact TEXT, likelihood TEXT)",
+        "mitigations": "CREATE TABLE mitigations (cwe_id INTEGER NOT NULL, phase TEXT, strategy TEXT, effectiveness TEXT, description TEXT)"}
+
+indexes = ["CREATE INDEX relations_target ON relations (view_id, target, nature, source)",
+        "CREATE INDEX mappings_entry ON mappings (taxonomy_name, entry_id, cwe_id)",
+        "CREATE INDEX mappings_cwe ON mappings (cwe_id, taxonomy_name, entry_id)",
+        "CREATE INDEX platforms_name ON platforms (kind, name, cwe_id)",
+        "CREATE INDEX platforms_cwe ON platforms (cwe_id)",
+        "CREATE INDEX consequences_scope ON consequences (scope, impact, cwe_id)",
+        "CREATE INDEX consequences_cwe ON consequences (cwe_id)",
+        "CREATE INDEX mitigations_phase ON mitigations (phase, cwe_id)",
+        "CREATE INDEX mitigations_cwe ON mitigations (cwe_id)"]
+
+def values(facts, f):
+        return sorted(uncode(v) for v in facts.get(f, ())) or [None]
+
+def collectRows(entries):
+        """Returns a dictionary table -> list of rows of the entity model."""
+        rows = {t: list() for t in tables}
+        for e in entries:
+                a = e.element.attrib
+                ID = int(a["ID"])
+                kind = e.element.tag.rsplit("}", 1)[-1]
+                description = first(e.annotations.get("Weakness_Description", ())) or first(e.annotations.get("Summary", ())) or first(e.annotations.get("Objective", ()))
+                rows["entries"].append((ID, kind, a.get("Name"), a.get("Abstraction"), a.get("Structure"), a.get("Status"), description))
+                for p, targets in e.object_facts.items():
+                        m = view_property.match(p)
+                        if m is None: continue
+                        for t in targets:
+                                rows["relations"].append((int(m.group(1)), ID, m.group(2), int(t[4:]), "Primary" if m.group(3) else None))
+                for ind in e.individuals:
+                        facts = ind.data_facts
+                        for t in ind.types:
+                                if t in platforms:
+                                        p = platforms[t]
+                                        rows["platforms"].append((ID, t, first(facts.get(p + "Name", ())), first(facts.get(p + "Class", ())), first(facts.get("Prevalence", ()))))
+                                elif t == "Consequence":
+                                        for scope in values(facts, "Scope"):
+                                                for impact in values(facts, "Impact"):
+                                                        rows["consequences"].append((ID, scope, impact, first(facts.get("Likelihood", ()))))
+                                elif t == "Taxonomy_Mapping":
+                                        rows["mappings"].append((ID, first(facts.get("Taxonomy_Name", ())), first(facts.get("Entry_ID", ())), first(facts.get("Entry_Name", ())), first(facts.get("Mapping_Fit", ()))))
+                                elif t == "Potential_Mitigation":
+                                        for phase in values(facts, "Phase"):
+                                                rows["mitigations"].append((ID, phase, first(facts.get("Strategy", ())), first(facts.get("Effectiveness", ())), first(ind.annotations.get("Potential_Mitigation_Description", ()))))
+        return rows
+
+def writeDatabase(entries, fn = "results/cwe.db"):
+        print("Generate SQLite database")
+        os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+        if os.path.exists(fn): os.remove(fn)
+        rows = collectRows(entries)
+        con = sqlite3.connect(fn)
+        try:
+                with con:
+                        for table, ddl in tables.items():
+                                con.execute(ddl)
+                                if rows[table]:
+                                        insert = "INSERT OR IGNORE INTO " + table + " VALUES (" + ", ".join("?" * len(rows[table][0])) + ")"
+                                        con.executemany(insert, rows[table])
+                        for ddl in indexes:
+                                con.execute(ddl)
+                con.execute("ANALYZE")
+        finally:
+                con.close()
+        print("Rows: " + ", ".join(t + " " + str(len(r)) for t, r in rows.items()))
+        return rows
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default="results/cwe.db", help='database file')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        writeDatabase(generator.extractEntries(generator.parseXML()), args.output)
+        print(f"Elapsed: {datetime.now() - start}")
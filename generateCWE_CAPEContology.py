@@ -1,38 +1,86 @@
-import urllib.request, zipfile
+"""CAPEC ontology generator.
+
+The generator streams the CAPEC List of MITRE with iterparse and generates an individual for every attack pattern with its description,
+prerequisites, likelihood of attack, typical severity, related weaknesses and relationships with the other attack patterns.
+Every attack pattern is written and released as soon as it is parsed, so the generation runs in constant memory.
+The ontology is generated with the file name "capec.ttl" from the shell "capec_shell.ttl".
+"""
+
+import argparse
 import xml.etree.ElementTree as etree
 from datetime import datetime
+from generateCWEontology import code, flat, Individual, openCatalog
+
+LS = "{http://capec.mitre.org/capec-3}"
+xml_fn = "data/capec.xml"
+natures = {"ChildOf", "ParentOf", "CanFollow", "CanPrecede", "CanAlsoBe", "PeerOf"}
+
+def text(element):
+        return flat(code("".join(element.itertext())))
+
+def generateAttackPattern(item):
+        ap = Individual("CAPEC-" + item.attrib["ID"])
+        ap.addType("CAPEC")
+        ap.addDataFact("ID", item.attrib["ID"])
+        for a in ("Name", "Abstraction", "Status"):
+                if a in item.attrib: ap.addDataFact(a, code(item.attrib[a]))
+        e = item.find(LS + "Description")
+        if e is not None: ap.addAnnotation("Description", text(e))
+        for tag in ("Likelihood_Of_Attack", "Typical_Severity"):
+                e = item.find(LS + tag)
+                if e is not None and e.text: ap.addDataFact(tag, code(e.text.strip()))
+        for e in item.findall(LS + "Prerequisites/" + LS + "Prerequisite"):
+                ap.addAnnotation("Prerequisite", text(e))
+        for e in item.findall(LS + "Related_Weaknesses/" + LS + "Related_Weakness"):
+                ap.addObjectFact("Related_Weakness", "cwe:CWE-" + e.attrib["CWE_ID"])
+        for e in item.findall(LS + "Related_Attack_Patterns/" + LS + "Related_Attack_Pattern"):
+                nature = e.attrib["Nature"]
+                if nature in natures: ap.addObjectFact(nature, "CAPEC-" + e.attrib["CAPEC_ID"])
+        return ap
+
+def generateShell(root, out_file):
+        with open("capec_shell.ttl", mode='r', encoding='utf-8') as in_file:
+                shell = in_file.read()
+        for a in ("NAME", "VERSION", "DATE"):
+                shell = shell.replace(a, code(root.attrib.get(a.capitalize(), "")))
+        out_file.write(shell)
+
+def generateIndividuals(fn = None, out_fn = "capec.ttl"):
+        """Streams the CAPEC List and writes the ontology, returns the number of attack patterns."""
+        count = 0
+        container = None
+        with openCatalog(fn or xml_fn) as in_file, open(out_fn, mode='w', encoding='utf-8') as out_file:
+                for event, item in etree.iterparse(in_file, events=("start", "end")):
+                        if event == "start":
+                                if item.tag == LS + "Attack_Pattern_Catalog":
+                                        generateShell(item, out_file)
+                                elif item.tag == LS + "Attack_Patterns":
+                                        container = item
+                                continue
+                        if item.tag == LS + "Attack_Pattern":
+                                print("CAPEC-" + item.attrib["ID"])
+                                out_file.write(generateAttackPattern(item).tostring())
+                                Individual.extend.clear()
+                                container.remove(item)
+                                count += 1
+                        elif item.tag in (LS + "Category", LS + "View", LS + "External_Reference"):
+                                item.clear()
+                out_file.write("\n")
+        return count
 
-LS = "{http://cwe.mitre.org/cwe-6}"
-
-def parseXML():
-        xml_fn = "data/cwec.xml"
-        tree = etree.parse(xml_fn)
-        return tree.getroot()
-
-def generateIndividuals(root):
-        
-        def generateShell(out_file):
-                with open("capec_shell.ttl", mode='r', encoding='utf-8') as in_file:
-                        shell = in_file.read()
-                        out_file.write(shell)
-                        
-        fn = "capec.ttl"
-        with open(fn, mode='w', encoding='utf-8') as out_file:
-                generateShell(out_file)
-                for item in root.findall(LS + "Weaknesses/" + LS + "Weakness/" + LS + "Related_Attack_Patterns/" + LS + "Related_Attack_Pattern"):
-                        print("CAPEC-" + item.attrib["CAPEC_ID"])
-                        out_file.write("\r:CAPEC-" + item.attrib["CAPEC_ID"] + "\r\trdf:type owl:NamedIndividual;\r\trdf:type :CAPEC .")
-
-def main():
-        print("CWE/CAPEC Ontology Generator, Version 2.0")
+def main(fn = None):
+        print("CWE/CAPEC Ontology Generator, Version 3.0")
         start = datetime.now()
         print(start)
-        root = parseXML()
-        generateIndividuals(root)
+        count = generateIndividuals(fn)
+        print(f"Attack patterns: {count}")
         print("Generation end")
         end = datetime.now()
         print(end)
         print(f"Elapsed: {end - start}")
 
 if __name__ == "__main__":
-        main()
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=xml_fn, help='CAPEC List file: .xml, .zip, .xml.gz or .xml.zst')
+        args = parser.parse_args()
+        main(args.input)
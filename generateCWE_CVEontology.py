@@ -1,12 +1,13 @@
 import urllib.request, zipfile
 import xml.etree.ElementTree as etree
 from datetime import datetime
+from generateCWEontology import openCatalog
 
 LS = "{http://cwe.mitre.org/cwe-6}"
 
 def parseXML():
-        xml_fn = "data/cwec.xml"
-        tree = etree.parse(xml_fn)
+        with openCatalog() as in_file:
+                tree = etree.parse(in_file)
         return tree.getroot()
 
 def generateIndividuals(root):
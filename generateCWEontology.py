@@ -1,24 +1,43 @@
 """CWE ontology generator.
 
 The generator downloads the current version of CWE List from MITRE site and then generates OWL Manchester syntax ontology.
-The dictionary is downloaded as .zip file and then it is unzipped.
+The dictionary is downloaded as .zip file and it is read directly from the .zip file.
 The ontology is generated with the file name "cwe.owl".
 """
 
-import urllib.request, re, sys, zipfile, argparse, cpe
+import re, sys, argparse, cpe
 import re, os
 import xml.etree.ElementTree as etree
-import lxml.etree
 from datetime import datetime
 from pathlib import Path
 
 LS = "{http://cwe.mitre.org/cwe-6}"
-xml_fn = "data/cwec.xml"
+catalog_fn = "data/cwec.xml"
+archive_fn = "data/cwec_latest.xml.zip"
+accounting = None
+view_property = re.compile(r"cwe-(\d+):(\w+?)(-Primary)?$")
+platforms = {"Language":"Language", "Operating_System":"OperatingSystem", "Architecture":"Architecture", "Technology":"Technology"}
+
+def defaultCatalog():
+        """Returns the CWE List read by default: the downloaded archive when it is newer than "data/cwec.xml" or "data/cwec.xml"."""
+        if os.path.exists(archive_fn) and (not os.path.exists(catalog_fn) or os.path.getmtime(archive_fn) >= os.path.getmtime(catalog_fn)): return archive_fn
+        return catalog_fn
+
+xml_fn = defaultCatalog()
 
 def code(s):
         if s is None: return ""
         return s.replace("\\", "\\\\").replace("\"", "\\\"")
 
+def uncode(s):
+        return re.sub(r"\\(.)", r"\1", s)
+
+def first(values):
+        """Returns the first decoded value of a fact or None."""
+        for v in values:
+                return uncode(v)
+        return None
+
 def flat(s):
         return " ".join([e.strip() for e in s.strip().splitlines()])
                
@@ -27,6 +46,23 @@ def stext(s, tag):
         r = re.sub("<ns0:" + tag + " xmlns:ns0=\"http://cwe.mitre.org/cwe-6\".*?>", "", r)
         return flat(r.replace("</ns0:" + tag + ">", ""))
 
+weakness_sections = ("Description", "Extended_Description", "Related_Weaknesses", "Background_Details", "Exploitation_Factors", "Weakness_Ordinalities", "Alternate_Terms",
+        "Likelihood_Of_Exploit", "Functional_Areas", "Modes_Of_Introduction", "Applicable_Platforms", "Common_Consequences", "Detection_Methods", "Potential_Mitigations",
+        "Demonstrative_Examples", "Observed_Examples", "Affected_Resources", "Taxonomy_Mappings", "Related_Attack_Patterns", "References", "Notes", "Content_History")
+category_sections = ("Summary", "Relationships", "Taxonomy_Mappings", "References", "Notes", "Content_History")
+view_sections = ("Objective", "Audience", "Members", "Filter", "References", "Notes", "Content_History")
+profiles = {"full": frozenset(weakness_sections + category_sections + view_sections),
+        "core": frozenset(("Description", "Related_Weaknesses", "Weakness_Ordinalities", "Applicable_Platforms", "Modes_Of_Introduction", "Taxonomy_Mappings",
+                "Related_Attack_Patterns", "Summary", "Relationships", "Objective", "Members", "Filter"))}
+
+def referenceIDs(element):
+        """Yields the external reference IDs of the references of an element with their section annotations or None."""
+        for ref in element.findall(LS + "References/" + LS + "Reference"):
+                ID = ref.attrib["External_Reference_ID"]
+                section = None
+                if "Section" in ref.attrib: section = flat(code(ID + ": " + ref.attrib["Section"]))
+                yield ID, section
+
 class Weakness:
         def __init__(self, element):
                 assert isinstance(element, etree.Element)
@@ -36,6 +72,7 @@ class Weakness:
                 self.data_facts = dict()
                 self.object_facts = dict()
                 self.types = set()
+                self.individuals = list()
                 
         def addType(self, aName):
                 if aName == "Category":
@@ -111,15 +148,14 @@ class Weakness:
                         self.annotations[n] = l
         
         def addReferences(self):
-                path = LS + "References/" + LS + "Reference"
-                name = "Reference"
-                for e in self.element.findall(path):
-                        if name not in self.annotations: self.annotations[name] = set()
-                        l = self.annotations[name]
-                        value = "External reference ID: " + e.attrib["External_Reference_ID"]
-                        if "Section" in e.attrib: value += "\nSection: " + e.attrib["Section"]
-                        l.add(flat(code(value)))
-                        self.annotations[name] = l
+                oName = "Has_Reference"
+                aName = "Reference_Section"
+                for ref, section in referenceIDs(self.element):
+                        if oName not in self.object_facts: self.object_facts[oName] = set()
+                        self.object_facts[oName].add(ref)
+                        if section is not None:
+                                if aName not in self.annotations: self.annotations[aName] = set()
+                                self.annotations[aName].add(section)
 
         def addContentHystory(self):
                 path = LS + "Content_History"
@@ -171,6 +207,7 @@ class Weakness:
                         name = self.IRI + "_" + cName + str(count)
                         ind = Individual(name)
                         ind.addType(cName)
+                        self.individuals.append(ind)
                         for k, v in cADict.items():
                                 if k in e.attrib: ind.addDataFact(v, code(e.attrib[k]))
                         ol.add(name)
@@ -185,6 +222,7 @@ class Weakness:
                         name = self.IRI + "_" + cName + str(count)
                         ind = Individual(name)
                         ind.addType(cName)
+                        self.individuals.append(ind)
                         for k, v in cADict.items():
                                 if k in e.attrib: ind.addDataFact(v, code(e.attrib[k]))
                         for k, v in cSDict.items():
@@ -206,10 +244,9 @@ class Weakness:
                         ol.add(name)
                         self.object_facts[oName] = ol
                         if references:
-                                for ref in e.findall(LS + "References/" + LS + "Reference"):
-                                        an = "External reference ID: " + flat(code(ref.attrib["External_Reference_ID"]))
-                                        if "Section" in ref.attrib: an += "\rSection: " + flat(code(ref.attrib["Section"]))
-                                        ind.addAnnotation("Reference", flat(code(an)))
+                                for ref, section in referenceIDs(e):
+                                        ind.addObjectFact("Has_Reference", ref)
+                                        if section is not None: ind.addAnnotation("Reference_Section", section)
                         count += 1
                         
         def addCAPEC(self):
@@ -222,21 +259,23 @@ class Weakness:
                         ol.add("capec:CAPEC-" + e.attrib["CAPEC_ID"])
                 self.object_facts[oName] = ol
      
-        def tostring(self):
-                r = "\n### " + self.IRI + "\n:" + self.IRI + "\n\trdf:type owl:NamedIndividual;\n\t:ID " + self.element.attrib["ID"]
+        def triples(self):
+                s = ":" + self.IRI
+                yield (s, "rdf:type", "owl:NamedIndividual")
+                yield (s, ":ID", self.element.attrib["ID"])
                 for t in self.types:
-                        r += ";\n\trdf:type :" + t
+                        yield (s, "rdf:type", ":" + t)
                 if self.annotations:
                         for a, l in self.annotations.items():
                                 for v in l:
-                                        r += ";\n\t:" + a + " \"" + v + "\""
+                                        yield (s, ":" + a, "\"" + v + "\"")
                 if self.data_facts:
                         for f, fd in self.data_facts.items():
                                 for fv, ad in fd.items():
                                         for a, avl in ad.items():
                                                 for av in avl:
-                                                        r += ";\n\t:" + a + " \"" + av + "\""
-                                        r += ";\n\t:" + f + " \"" + fv + "\""
+                                                        yield (s, ":" + a, "\"" + av + "\"")
+                                        yield (s, ":" + f, "\"" + fv + "\"")
                 if self.object_facts:
                         for f, fl in self.object_facts.items():
                                 fact = ""
@@ -246,8 +285,17 @@ class Weakness:
                                         value = ""
                                         if ":" not in ind: value = ":"
                                         value += ind
-                                        r += ";\n\t" + fact + " " + value
-                return r + "."
+                                        yield (s, fact, value)
+
+        def tostring(self):
+                t = list(self.triples())
+                r = "\n### " + self.IRI + "\n:" + self.IRI + "\n\t" + ";\n\t".join(p + " " + o for s, p, o in t) + "."
+                if accounting is not None: accounting.record(self.element.tag.rsplit("}", 1)[-1], self.IRI, t, r)
+                return r
+
+        def render(self):
+                """Returns the Turtle of the entry followed by the Turtle of its individuals."""
+                return self.tostring() + "".join(i.tostring() for i in self.individuals)
         
         def addMembers(self, relationships = False):
                 if relationships:
@@ -260,7 +308,7 @@ class Weakness:
                                 oName = "cwe-" + str(el.attrib["View_ID"]) + ":Member_Of"
                                 if oName not in self.object_facts: self.object_facts[oName] = set()
                                 ol = self.object_facts[oName]
-                                ol.add("cwe-" + str(el.attrib["CWE_ID"]))
+                                ol.add("CWE-" + str(el.attrib["CWE_ID"]))
                                 self.object_facts[oName] = ol
                         for el in e.findall(LS + "Has_Member"):
                                 oName = "cwe-" + str(el.attrib["View_ID"]) + ":Has_Member"
@@ -306,6 +354,7 @@ class Weakness:
                         name = self.IRI + "_" + oName + str(count)
                         ind = Individual(name)
                         ind.addType(oName)
+                        self.individuals.append(ind)
                         if aName in e.attrib: ind.addDataFact(aName, code(e.attrib[aName]))
                         tt = "Title_Text"
                         se = e.find(LS + tt)
@@ -323,16 +372,16 @@ class Weakness:
                                 ind.addObjectFact(ec, name2)
                                 ind2 = Individual(name2)
                                 ind2.addType(ec)
+                                self.individuals.append(ind2)
                                 ind2.addDataFact("Nature", sc.attrib["Nature"])
                                 if "Language" in sc.attrib: ind2.addDataFact("LanguageName", sc.attrib["Language"])
                                 ind2.addAnnotation("Structured_Code", code(stext(etree.tostring(sc).decode('UTF-8'), "Example_Code")))
                                 count2 += 1
                         ol.add(name)
                         self.object_facts[oName] = ol
-                        for ref in e.findall(LS + "References/" + LS + "Reference"):
-                                an = "External reference ID: " + ref.attrib["External_Reference_ID"]
-                                if "Section" in ref.attrib: an += "\rSection: " + ref.attrib["Section"]
-                                ind.addAnnotation("Reference", flat(code(an)))
+                        for ref, section in referenceIDs(e):
+                                ind.addObjectFact("Has_Reference", ref)
+                                if section is not None: ind.addAnnotation("Reference_Section", section)
                         count += 1
                 
 class Individual:
@@ -361,126 +410,150 @@ class Individual:
                 s = self.annotations[a]
                 s.add(v)
                 self.annotations[a] = s
-        def tostring(self):
-                r = "\n###  " + self.name + "\n:" + self.name + "\n\trdf:type owl:NamedIndividual"
+        def triples(self):
+                s = ":" + self.name
+                yield (s, "rdf:type", "owl:NamedIndividual")
                 if self.types:
                         for t in self.types:
-                                 r += ";\n\trdf:type :" + t
+                                yield (s, "rdf:type", ":" + t)
                 if self.annotations:
                         for a, av in self.annotations.items():
                                 for l in av:
-                                        r += ";\n\t:" + a + " \"" + l + "\""
+                                        yield (s, ":" + a, "\"" + l + "\"")
                 if self.data_facts:
                         for f, fv in self.data_facts.items():
                                 for v in fv:
                                         if f == "Link":
-                                                r += ";\n\t:" + f + " \"" + v + "\"^^xsd:anyURI"
+                                                yield (s, ":" + f, "\"" + v + "\"^^xsd:anyURI")
                                         else:
-                                                r += ";\n\t:" + f + " \"" + v + "\""
+                                                yield (s, ":" + f, "\"" + v + "\"")
                 if self.object_facts:
                         for f, fv in self.object_facts.items():
                                 for v in fv:
                                         if f == "CPE_ID":
-                                                r += ";\n\tcpe:CPE_ID " + convert_fs_to_compressed_uri(v)
+                                                yield (s, "cpe:CPE_ID", cpe.convert_fs_to_compressed_uri(v))
                                         else:
                                                 if ":" not in v: v = ":" + v
-                                                r += ";\n\t:" + f + " " + v
-                return r + "."
+                                                yield (s, ":" + f, v)
+
+        def tostring(self):
+                t = list(self.triples())
+                r = "\n###  " + self.name + "\n:" + self.name + "\n\t" + ";\n\t".join(p + " " + o for s, p, o in t) + "."
+                if accounting is not None: accounting.record("+".join(sorted(self.types)) or "Individual", self.name.split("_", 1)[0], t, r)
+                return r
+        def render(self):
+                return self.tostring()
                                 
 
 def downloadCWE():
+        import urllib.request
         url = "https://cwe.mitre.org/data/xml/cwec_latest.xml.zip"
-        fileName = "data/cwec_latest.xml.zip"
         with urllib.request.urlopen(url) as response:
                 contents = response.read()
-                with open(fileName, mode='wb') as out_file:
+                with open(archive_fn, mode='wb') as out_file:
                         out_file.write(contents)
-        with zipfile.ZipFile(fileName, 'r') as zip_ref:
-            zip_ref.extractall(path="data")
-            xml = os.replace("data/" + zip_ref.namelist()[0], "data/cwec.xml")
+        return archive_fn
+
+def openCatalog(fn = None):
+        """Opens the CWE List as a binary stream: an XML file, the XML member of a .zip file or a .gz or .zst compressed XML file."""
+        if fn is None: fn = xml_fn
+        if fn.endswith(".zip"):
+                import zipfile
+                with zipfile.ZipFile(fn, 'r') as zip_ref:
+                        return zip_ref.open([n for n in zip_ref.namelist() if n.endswith(".xml")][0])
+        if fn.endswith(".gz"):
+                import gzip
+                return gzip.open(fn, 'rb')
+        if fn.endswith(".zst"):
+                import zstandard
+                return zstandard.ZstdDecompressor().stream_reader(open(fn, 'rb'), closefd=True)
+        return open(fn, 'rb')
 
 def parseXML():
-        tree = etree.parse(xml_fn)
+        with openCatalog() as in_file:
+                tree = etree.parse(in_file)
         return tree.getroot()
 
-def generateWeaknessIndividual(item, out_file):
+def generateWeaknessIndividual(item, out_file = None, sections = profiles["full"]):
         weakness = Weakness(item)
-        weakness.addAnnotation("Description", name = "Weakness_Description")
-        weakness.addAnnotation("Extended_Description", structured = True)
-        weakness.addRelatedWeaknesses()
-        weakness.addAnnotation("Background_Detail", path = LS + "Background_Details/", structured = True)
-        weakness.addAnnotation("Exploitation_Factor", path = LS + "Exploitation_Factors/", structured = True)
+        if "Description" in sections: weakness.addAnnotation("Description", name = "Weakness_Description")
+        if "Extended_Description" in sections: weakness.addAnnotation("Extended_Description", structured = True)
+        if "Related_Weaknesses" in sections: weakness.addRelatedWeaknesses()
+        if "Background_Details" in sections: weakness.addAnnotation("Background_Detail", path = LS + "Background_Details/", structured = True)
+        if "Exploitation_Factors" in sections: weakness.addAnnotation("Exploitation_Factor", path = LS + "Exploitation_Factors/", structured = True)
         weakness.addType("Abstraction")
         weakness.addType("Structure")
         weakness.addType("Status")
         weakness.addDataFactFromAttribute("Name")
-        weakness.addDataFactWithAnnotation("Ordinality", "Description", path = LS + "Weakness_Ordinalities/" + LS + "Weakness_Ordinality/", name = "Weakness_Ordinality", aName = "Weakness_Ordinality_Description")
-        weakness.addDataFactWithAnnotation("Term", "Description", path = LS + "Alternate_Terms/" + LS + "Alternate_Term/", name = "Alternate_Term", aName = "Alternate_Term_Description", structured = True)
-        weakness.addDataFact("Likelihood_Of_Exploit")
-        weakness.addDataFact("Functional_Area", path = LS + "Functional_Areas/")
-        weakness.addDataFactWithAnnotation("Phase", "Note", path = LS + "Modes_Of_Introduction/" + LS + "Introduction/", name = "Mode_Of_Introduction", aName = "Mode_Of_Introduction_Note")
+        if "Weakness_Ordinalities" in sections: weakness.addDataFactWithAnnotation("Ordinality", "Description", path = LS + "Weakness_Ordinalities/" + LS + "Weakness_Ordinality/", name = "Weakness_Ordinality", aName = "Weakness_Ordinality_Description")
+        if "Alternate_Terms" in sections: weakness.addDataFactWithAnnotation("Term", "Description", path = LS + "Alternate_Terms/" + LS + "Alternate_Term/", name = "Alternate_Term", aName = "Alternate_Term_Description", structured = True)
+        if "Likelihood_Of_Exploit" in sections: weakness.addDataFact("Likelihood_Of_Exploit")
+        if "Functional_Areas" in sections: weakness.addDataFact("Functional_Area", path = LS + "Functional_Areas/")
+        if "Modes_Of_Introduction" in sections: weakness.addDataFactWithAnnotation("Phase", "Note", path = LS + "Modes_Of_Introduction/" + LS + "Introduction/", name = "Mode_Of_Introduction", aName = "Mode_Of_Introduction_Note")
         lang = {"Name":"LanguageName", "Class":"LanguageClass", "Prevalence":"Prevalence"}
-        weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Language", lang)
+        if "Applicable_Platforms" in sections: weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Language", lang)
         os = {"Name":"OperatingSystemName", "Class":"OperatingSystemClass", "Prevalence":"Prevalence", "Version":"Version", "CPE_ID":"CPE_ID"}
-        weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Operating_System", os)
+        if "Applicable_Platforms" in sections: weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Operating_System", os)
         arch = {"Name":"ArchitectureName", "Class":"ArchitectureClass", "Prevalence":"Prevalence"}
-        weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Architecture", arch)
+        if "Applicable_Platforms" in sections: weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Architecture", arch)
         tech = {"Name":"TechnologyName", "Class":"TechnologyClass", "Prevalence":"Prevalence"}
-        weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Technology", tech)
+        if "Applicable_Platforms" in sections: weakness.addObjectFact(LS + "Applicable_Platforms/", "Applicable_Platform", "Technology", tech)
         ca = {"Consequence_ID":"Consequence_ID"}
         ce = {"Scope":"Scope", "Impact":"Impact", "Likelihood":"Likelihood"}
         can = {"Note":("Consequence_Note", True)}
-        weakness.addObjectFactWithAnnotation(LS + "Common_Consequences/" + LS + "Consequence", "Common_Consequence", "Consequence", cADict = ca, cSDict = ce, cANDict = can)
+        if "Common_Consequences" in sections: weakness.addObjectFactWithAnnotation(LS + "Common_Consequences/" + LS + "Consequence", "Common_Consequence", "Consequence", cADict = ca, cSDict = ce, cANDict = can)
         ca = {"Detection_Method_ID":"Detection_Method_ID"}
         ce = {"Method":"Method", "Effectiveness":"Detection_Effectiveness"}
         can = {"Description":("Detection_Method_Description", True), "Effectiveness_Notes":("Effectiveness_Note", True)}
-        weakness.addObjectFactWithAnnotation(LS + "Detection_Methods/" + LS + "Detection_Method", "Detection_Method", "Detection_Method", cADict = ca, cSDict = ce, cANDict = can)
+        if "Detection_Methods" in sections: weakness.addObjectFactWithAnnotation(LS + "Detection_Methods/" + LS + "Detection_Method", "Detection_Method", "Detection_Method", cADict = ca, cSDict = ce, cANDict = can)
         ca = {"Mitigation_ID":"Mitigation_ID"}
         ce = {"Phase":"Phase", "Strategy":"Strategy", "Effectiveness":"Effectiveness"}
         can = {"Description":("Potential_Mitigation_Description", True), "Effectiveness_Notes":("Effectiveness_Note", True)}
-        weakness.addObjectFactWithAnnotation(LS + "Potential_Mitigations/" + LS + "Mitigation", "Potential_Mitigation", "Potential_Mitigation", cADict = ca, cSDict = ce, cANDict = can)
-        weakness.addDemonstrativeExamples()
+        if "Potential_Mitigations" in sections: weakness.addObjectFactWithAnnotation(LS + "Potential_Mitigations/" + LS + "Mitigation", "Potential_Mitigation", "Potential_Mitigation", cADict = ca, cSDict = ce, cANDict = can)
+        if "Demonstrative_Examples" in sections: weakness.addDemonstrativeExamples()
         ce = {"Link":"Link", "Reference":"Observed_Example_Reference"}
         can = {"Description":("Observed_Example_Description", True)}
-        weakness.addObjectFactWithAnnotation(LS + "Observed_Examples/" + LS + "Observed_Example", "Observed_Example", "Observed_Example", cSDict = ce, cANDict = can)
-        weakness.addDataFact("Affected_Resource", path = LS + "Affected_Resources/")
+        if "Observed_Examples" in sections: weakness.addObjectFactWithAnnotation(LS + "Observed_Examples/" + LS + "Observed_Example", "Observed_Example", "Observed_Example", cSDict = ce, cANDict = can)
+        if "Affected_Resources" in sections: weakness.addDataFact("Affected_Resource", path = LS + "Affected_Resources/")
         ca = {"Taxonomy_Name":"Taxonomy_Name"}
         ce = {"Entry_ID":"Entry_ID", "Entry_Name":"Entry_Name", "Mapping_Fit":"Mapping_Fit"}
-        weakness.addObjectFactWithAnnotation(LS + "Taxonomy_Mappings/" + LS + "Taxonomy_Mapping", "Taxonomy_Mapping", "Taxonomy_Mapping", cADict = ca, cSDict = ce)
-        weakness.addCAPEC()
-        weakness.addReferences()
+        if "Taxonomy_Mappings" in sections: weakness.addObjectFactWithAnnotation(LS + "Taxonomy_Mappings/" + LS + "Taxonomy_Mapping", "Taxonomy_Mapping", "Taxonomy_Mapping", cADict = ca, cSDict = ce)
+        if "Related_Attack_Patterns" in sections: weakness.addCAPEC()
+        if "References" in sections: weakness.addReferences()
         ca = {"Type":"Type"}
-        weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
-        weakness.addContentHystory()
-        out_file.write(weakness.tostring())
+        if "Notes" in sections: weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
+        if "Content_History" in sections: weakness.addContentHystory()
+        if out_file is not None: out_file.write(weakness.tostring())
+        return weakness
 
-def generateCategoryIndividual(item, out_file):
+def generateCategoryIndividual(item, out_file = None, sections = profiles["full"]):
         weakness = Weakness(item)
         weakness.addType("Category")
         weakness.addType("Status")
         weakness.addDataFactFromAttribute("Name")
-        weakness.addAnnotation("Summary")
-        weakness.addMembers(relationships = True)
+        if "Summary" in sections: weakness.addAnnotation("Summary")
+        if "Relationships" in sections: weakness.addMembers(relationships = True)
         ca = {"Taxonomy_Name":"Taxonomy_Name"}
         ce = {"Entry_ID":"Entry_ID", "Entry_Name":"Entry_Name", "Mapping_Fit":"Mapping_Fit"}
-        weakness.addObjectFactWithAnnotation(LS + "Taxonomy_Mappings/" + LS + "Taxonomy_Mapping", "Taxonomy_Mapping", "Taxonomy_Mapping", cADict = ca, cSDict = ce)
-        weakness.addReferences()
+        if "Taxonomy_Mappings" in sections: weakness.addObjectFactWithAnnotation(LS + "Taxonomy_Mappings/" + LS + "Taxonomy_Mapping", "Taxonomy_Mapping", "Taxonomy_Mapping", cADict = ca, cSDict = ce)
+        if "References" in sections: weakness.addReferences()
         ca = {"Type":"Type"}
-        weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
-        weakness.addContentHystory()
-        out_file.write(weakness.tostring())
+        if "Notes" in sections: weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
+        if "Content_History" in sections: weakness.addContentHystory()
+        if out_file is not None: out_file.write(weakness.tostring())
+        return weakness
 
-def generateViewIndividual(item, root, out_file):
+def generateViewIndividual(item, root, out_file = None, sections = profiles["full"]):
         weakness = Weakness(item)
         weakness.addType("Type")
         weakness.addType("Status")
         weakness.addDataFactFromAttribute("Name")
-        weakness.addAnnotation("Objective")
-        weakness.addDataFactWithAnnotation("Type", "Description", path = LS + "Audience/" + LS + "Stakeholder/", name = "Audience", aName = "Audience_Description")
-        weakness.addMembers()
-        weakness.addAnnotation("Filter")
+        if "Objective" in sections: weakness.addAnnotation("Objective")
+        if "Audience" in sections: weakness.addDataFactWithAnnotation("Type", "Description", path = LS + "Audience/" + LS + "Stakeholder/", name = "Audience", aName = "Audience_Description")
+        if "Members" in sections: weakness.addMembers()
+        if "Filter" in sections: weakness.addAnnotation("Filter")
         f = item.find(LS + "Filter")
-        if f is not None:
+        if f is not None and "Filter" in sections:
                 n = int(item.attrib["ID"])
                 if n == 1040:
                         for w in root.findall(LS + "Weaknesses/" + LS + "Weakness"):
@@ -573,160 +646,262 @@ def generateViewIndividual(item, root, out_file):
                                                 break
                                 if not found: weakness.addContent(item.attrib["ID"], w.attrib["ID"])
                         
-        weakness.addReferences()
+        if "References" in sections: weakness.addReferences()
         ca = {"Type":"Type"}
-        weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
-        weakness.addContentHystory()
-        out_file.write(weakness.tostring())
-
-def generateIndividuals(root):
-
-        def generateShell():
-
-                def stripNLinStrings(shell):
-                        l = shell.split('"')
-                        i = 1
-                        while i < len(l):
-                                #l[i] = l[i].replace("\n", "")
-                                i += 2
-                        return '"'.join(l)
-
-                def collectExternalReferences():
-                        print("Generate external references")
-                        externalreferences = root.find(LS + "External_References")
-                        r = ""
-                        if externalreferences is not None:
-                                for e in externalreferences.findall(LS + "External_Reference"):
-                                        r += ':External_Reference "'
-                                        if "Reference_ID" in e.attrib: r += "\r\tReference_ID: " + flat(code(e.attrib["Reference_ID"]))
-                                        for a in e.findall(LS + "Author"):
-                                                r += "\r\tAuthor: " + flat(code(a.text))
-                                        r += "\r\tTitle: " + flat(code(e.find(LS + "Title").text))
-                                        ed = e.find(LS + "Edition")
-                                        if ed is not None: r += "\r\tEdition: " + flat(code(ed.text))
-                                        p = e.find(LS + "Publication")
-                                        if p is not None: r += "\r\tPublication: " + flat(code(p.text))
-                                        p = e.find(LS + "Publication_Year")
-                                        if p is not None: r += "\r\tPublication year: " + flat(code(p.text))
-                                        p = e.find(LS + "Publication_Month")
-                                        if p is not None: r += "\r\tPublication month: " + flat(code(p.text))
-                                        p = e.find(LS + "Publication_Day")
-                                        if p is not None: r += "\r\tPublication day: " + flat(code(p.text))
-                                        p = e.find(LS + "Publisher")
-                                        if p is not None: r += "\r\tPublisher: " + flat(code(p.text))
-                                        url = e.find(LS + "URL")
-                                        if url is not None: r += "\r\tURL: " + flat(code(url.text))
-                                        url = e.find(LS + "URL_Date")
-                                        if url is not None: r += "\r\tURL date: " + flat(code(url.text))
-                                        r += '"@en ;\n'
-                        return r
-
-                views = root.find(LS + "Views")
-                for item in views.findall(LS + "View"):
-                        view = "cwe-" + item.attrib["ID"]
-                        out_file.write("@prefix " + view + ": <http://www.semanticweb.org/cwe/" + view + "#> .\n")
-                        
-                with open("shell.ttl", mode='r', encoding='utf-8') as in_file:
-                        shell = in_file.read()
-                        name = root.attrib["Name"]
-                        name = "" if name is None else name
-                        shell = shell.replace("NAME", name)
-                        version = root.attrib["Version"]
-                        version = "" if version is None else version
-                        shell = shell.replace("VERSION", version)
-                        date = root.attrib["Date"]
-                        date = "" if date is None else date
-                        shell = shell.replace("DATE", date)
-                        #shell = stripNLinStrings(shell)
-                        shell = shell.replace(':External_Reference ""@en ;', collectExternalReferences())
-                        out_file.write(shell)
-
-                for item in views.findall(LS + "View"):
-                        view = "cwe-" + item.attrib["ID"]
-                        out_file.write("\n" + view + ":Has_Member rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :Has_Member;\n\towl:inverseOf " + view + ":Member_Of .")
-                        out_file.write("\n" + view + ":Member_Of rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :Member_Of;\n\towl:inverseOf " + view + ":Has_Member .")
-                        out_file.write("\n" + view + ":ChildOf rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :ChildOf;\n\towl:inverseOf " + view + ":ParentOf .")
-                        out_file.write("\n" + view + ":ChildOf-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":ChildOf;\n\towl:inverseOf " + view + ":ParentOf-Primary .")
-                        out_file.write("\n" + view + ":ParentOf rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :ParentOf;\n\towl:inverseOf " + view + ":ChildOf .")
-                        out_file.write("\n" + view + ":ParentOf-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":ParentOf;\n\towl:inverseOf " + view + ":ChildOf-Primary .")
-                        if item.attrib["ID"] == "709":
-                                out_file.write("\n" + view + ":StartsWith rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :StartsWith .")
-                                out_file.write("\n" + view + ":StartsWith-Primary rdf:type owl:ObjectProperty; \n\trdfs:subPropertyOf " + view + ":StartsWith .")
-                                out_file.write("\n" + view + ":StartOfChain rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :StartOfChain .")
-                                out_file.write("\n" + view + ":StartStartOfChain-Primary rdf:type owl:ObjectProperty; \n\trdfs:subPropertyOf " + view + ":StartOfChain .")
-                                out_file.write("\n" + view + ":CanFollow rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :CanFollow;\n\trdf:type owl:InverseFunctionalProperty;\n\towl:inverseOf " + view + ":CanPrecede .")
-                                out_file.write("\n" + view + ":CanFollow-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":CanFollow;\n\trdf:type owl:InverseFunctionalProperty;\n\towl:inverseOf " + view + ":CanPrecede-Primary .")
-                                out_file.write("\n" + view + ":CanPrecede rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :CanPrecede;\n\trdf:type owl:InverseFunctionalProperty;\n\towl:inverseOf " + view + ":CanFollow .")
-                                out_file.write("\n" + view + ":CanPrecede-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":CanPrecede;\n\trdf:type owl:InverseFunctionalProperty;\n\towl:inverseOf " + view + ":CanFollow-Primary .")
-                        else:
-                                out_file.write("\n" + view + ":CanFollow rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :CanFollow;\n\towl:inverseOf " + view + ":CanPrecede .")
-                                out_file.write("\n" + view + ":CanFollow-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":CanFollow;\n\towl:inverseOf " + view + ":CanPrecede-Primary .")
-                                out_file.write("\n" + view + ":CanPrecede rdf:type owl:ObjectProperty; \n\trdfs:subPropertyOf :CanPrecede;\n\towl:inverseOf " + view + ":CanFollow .")
-                                out_file.write("\n" + view + ":CanPrecede-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":CanPrecede;\n\towl:inverseOf " + view + ":CanFollow-Primary .")
-                        out_file.write("\n" + view + ":RequiredBy rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :RequiredBy;\n\towl:inverseOf " + view + ":Requires .")
-                        out_file.write("\n" + view + ":RequiredBy-Primary rdf:type owl:ObjectProperty; \n\trdfs:subPropertyOf " + view + ":RequiredBy;\n\towl:inverseOf " + view + ":Requires-Primary .")
-                        out_file.write("\n" + view + ":Requires rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :Requires;\n\towl:inverseOf " + view + ":RequiredBy .")
-                        out_file.write("\n" + view + ":Requires-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":Requires;\n\towl:inverseOf " + view + ":RequiredBy-Primary .")
-                        out_file.write("\n" + view + ":CanAlsoBe rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :CanAlsoBe .")
-                        out_file.write("\n" + view + ":CanAlsoBe-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":CanAlsoBe .")
-                        out_file.write("\n" + view + ":PeerOf rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf :PeerOf .")
-                        out_file.write("\n"+ view + ":PeerOf-Primary rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + view + ":PeerOf .")                                                         
-                out_file.write("\n")
+        if "Notes" in sections: weakness.addObjectFactWithAnnotation(LS + "Notes/" + LS + "Note", "Note", "Note", cADict = ca, note = True)
+        if "Content_History" in sections: weakness.addContentHystory()
+        if out_file is not None: out_file.write(weakness.tostring())
+        return weakness
+
+def generateExternalReferences(root):
+        """Creates an individual for every external reference of the CWE List."""
+        print("Generate external references")
+        r = list()
+        externalreferences = root.find(LS + "External_References")
+        if externalreferences is None: return r
+        fields = ("Author", "Title", "Edition", "Publication", "Publication_Year", "Publication_Month", "Publication_Day", "Publisher", "URL", "URL_Date")
+        for e in externalreferences.findall(LS + "External_Reference"):
+                ind = Individual(e.attrib["Reference_ID"])
+                ind.addType("External_Reference")
+                ind.addDataFact("Reference_ID", code(e.attrib["Reference_ID"]))
+                for tag in fields:
+                        for el in e.findall(LS + tag):
+                                ind.addDataFact(tag, flat(code(el.text)))
+                r.append(ind)
+        return r
+
+def viewProperties(viewID):
+        """Returns the object properties of a view as tuples (property, super property, inverse property, inverse functional)."""
+        view = "cwe-" + str(viewID)
+        chain = str(viewID) == "709"
+        r = [(view + ":Has_Member", ":Has_Member", view + ":Member_Of", False),
+                (view + ":Member_Of", ":Member_Of", view + ":Has_Member", False),
+                (view + ":ChildOf", ":ChildOf", view + ":ParentOf", False),
+                (view + ":ChildOf-Primary", view + ":ChildOf", view + ":ParentOf-Primary", False),
+                (view + ":ParentOf", ":ParentOf", view + ":ChildOf", False),
+                (view + ":ParentOf-Primary", view + ":ParentOf", view + ":ChildOf-Primary", False)]
+        if chain:
+                r += [(view + ":StartsWith", ":StartsWith", None, False),
+                        (view + ":StartsWith-Primary", view + ":StartsWith", None, False),
+                        (view + ":StartOfChain", ":StartOfChain", None, False),
+                        (view + ":StartStartOfChain-Primary", view + ":StartOfChain", None, False)]
+        r += [(view + ":CanFollow", ":CanFollow", view + ":CanPrecede", chain),
+                (view + ":CanFollow-Primary", view + ":CanFollow", view + ":CanPrecede-Primary", chain),
+                (view + ":CanPrecede", ":CanPrecede", view + ":CanFollow", chain),
+                (view + ":CanPrecede-Primary", view + ":CanPrecede", view + ":CanFollow-Primary", chain),
+                (view + ":RequiredBy", ":RequiredBy", view + ":Requires", False),
+                (view + ":RequiredBy-Primary", view + ":RequiredBy", view + ":Requires-Primary", False),
+                (view + ":Requires", ":Requires", view + ":RequiredBy", False),
+                (view + ":Requires-Primary", view + ":Requires", view + ":RequiredBy-Primary", False),
+                (view + ":CanAlsoBe", ":CanAlsoBe", None, False),
+                (view + ":CanAlsoBe-Primary", view + ":CanAlsoBe", None, False),
+                (view + ":PeerOf", ":PeerOf", None, False),
+                (view + ":PeerOf-Primary", view + ":PeerOf", None, False)]
+        return r
+
+def generateShell(root, out_file, shell_fn = "shell.ttl"):
+
+        def stripNLinStrings(shell):
+                l = shell.split('"')
+                i = 1
+                while i < len(l):
+                        #l[i] = l[i].replace("\n", "")
+                        i += 2
+                return '"'.join(l)
+
+        views = root.find(LS + "Views")
+        for item in views.findall(LS + "View"):
+                view = "cwe-" + item.attrib["ID"]
+                prefix = "@prefix " + view + ": <http://www.semanticweb.org/cwe/" + view + "#> .\n"
+                out_file.write(prefix)
+                if accounting is not None: accounting.record("Shell", shell_fn, [], prefix)
                 
+        with open(shell_fn, mode='r', encoding='utf-8') as in_file:
+                shell = in_file.read()
+                name = root.attrib["Name"]
+                name = "" if name is None else name
+                shell = shell.replace("NAME", name)
+                version = root.attrib["Version"]
+                version = "" if version is None else version
+                shell = shell.replace("VERSION", version)
+                date = root.attrib["Date"]
+                date = "" if date is None else date
+                shell = shell.replace("DATE", date)
+                #shell = stripNLinStrings(shell)
+                out_file.write(shell)
+                if accounting is not None: accounting.recordTemplate("Shell", shell_fn, shell)
+
+        for item in views.findall(LS + "View"):
+                for p, sp, inv, ifp in viewProperties(item.attrib["ID"]):
+                        r = "\n" + p + " rdf:type owl:ObjectProperty;\n\trdfs:subPropertyOf " + sp
+                        if ifp: r += ";\n\trdf:type owl:InverseFunctionalProperty"
+                        if inv is not None: r += ";\n\towl:inverseOf " + inv
+                        out_file.write(r + " .")
+                        if accounting is not None:
+                                t = [(p, "rdf:type", "owl:ObjectProperty"), (p, "rdfs:subPropertyOf", sp)]
+                                if ifp: t.append((p, "rdf:type", "owl:InverseFunctionalProperty"))
+                                if inv is not None: t.append((p, "owl:inverseOf", inv))
+                                accounting.record("View_Property", "cwe-" + item.attrib["ID"], t, r + " .")
+        out_file.write("\n")
+
+def generateIndividuals(root, sections = profiles["full"], fn = "results/cwe.ttl"):
         print("Processing started")
-        fn = "results/cwe.ttl"
+        Individual.extend.clear()
         
-        p = Path("results")
+        p = Path(fn).parent
         try:
-                p.mkdir()
+                p.mkdir(parents=True)
         except FileExistsError as exc:
                 print(exc)
                 
         out_file = open(fn, mode='w', encoding='utf-8')
                 
-        generateShell()
+        generateShell(root, out_file)
+        if "References" in sections: generateExternalReferences(root)
 
+        entries = list()
         print("Generate weaknesses")
         weaknesses = root.find(LS + "Weaknesses")
         for item in weaknesses.findall(LS + "Weakness"):
                 print("CWE-" + item.attrib["ID"])
-                generateWeaknessIndividual(item, out_file)
+                entries.append(generateWeaknessIndividual(item, out_file, sections))
                 
         print("Generate categories")
         categories = root.find(LS + "Categories")
         for item in categories.findall(LS + "Category"):
                 print("CWE-" + item.attrib["ID"])
-                generateCategoryIndividual(item, out_file)
+                entries.append(generateCategoryIndividual(item, out_file, sections))
                 
         print("Generate views")
         views = root.find(LS + "Views")
         for item in views.findall(LS + "View"):
                 print("CWE-" + item.attrib["ID"])
-                generateViewIndividual(item, root, out_file)
+                entries.append(generateViewIndividual(item, root, out_file, sections))
                 
         for i in Individual.extend:
                 out_file.write(i.tostring())
                 
         out_file.close()
         print("Processing finished")
+        return entries
 
-def main(download):
+def extractEntries(root, sections = profiles["full"]):
+        """Extracts the weaknesses, categories and views of the CWE List without writing them."""
+        entries = list()
+        for item in root.findall(LS + "Weaknesses/" + LS + "Weakness"):
+                entries.append(generateWeaknessIndividual(item, sections = sections))
+        for item in root.findall(LS + "Categories/" + LS + "Category"):
+                entries.append(generateCategoryIndividual(item, sections = sections))
+        for item in root.findall(LS + "Views/" + LS + "View"):
+                entries.append(generateViewIndividual(item, root, sections = sections))
+        return entries
+
+def writeIndividuals(root, entries, sections = profiles["full"], fn = "results/cwe.ttl"):
+        """Writes the ontology of already extracted entries."""
+        print("Processing started")
+        Path(fn).parent.mkdir(parents=True, exist_ok=True)
+        with open(fn, mode='w', encoding='utf-8') as out_file:
+                generateShell(root, out_file)
+                for e in entries:
+                        out_file.write(e.tostring())
+                if "References" in sections:
+                        for i in generateExternalReferences(root):
+                                out_file.write(i.tostring())
+                for e in entries:
+                        for i in e.individuals:
+                                out_file.write(i.tostring())
+        Individual.extend.clear()
+        print("Processing finished")
+
+def readCatalog(validate = "whole", skip_invalid = False, processes = None):
+        """Validates and parses the CWE List and returns its root or None if it is not valid."""
+        invalid = set()
+        if validate != "none":
+                import validation, lxml.etree
+                with openCatalog() as in_file:
+                        xml_file = lxml.etree.parse(in_file)
+                if validate == "whole":
+                        error_log = validation.validateDocument(xml_file)
+                        if error_log is not None:
+                                print("CWE List contents is not valid!")
+                                print(error_log)
+                                return None
+                else:
+                        errors = validation.validateEntries(xml_file, processes = processes)
+                        if errors:
+                                print("CWE List contents is not valid!")
+                                validation.printErrors(errors)
+                                if not skip_invalid or "Weakness_Catalog" in errors: return None
+                                invalid = set(errors)
+                xml_file = None
+        root = parseXML()
+        if invalid:
+                print("Skip invalid entries: " + ", ".join(sorted(invalid)))
+                for container in root:
+                        for item in container.findall("*"):
+                                if "CWE-" + item.attrib.get("ID", "") in invalid: container.remove(item)
+        return root
+
+def main(download, *, closure = None, materialize = False, validate = "whole", skip_invalid = False, processes = None, columnar = None, sections = profiles["full"], shards = None, snapshot = False, sqlite = False, index = False, sizes = False, pipeline = False, compress = None, subset = None):
         print("CWE Ontology Generator, Version 6.5")
         start = datetime.now()
         print(start)
+        global xml_fn, accounting
         if download:
                 print("Download CWE List")
-                downloadCWE()
-        xml_file = lxml.etree.parse("data/cwec.xml")
-        xml_validator = lxml.etree.XMLSchema(file="data/cwe_schema_latest.xsd")
-        if not xml_validator.validate(xml_file):
-                print("CWE List contents is not valid!")
-                print(xml_validator.error_log)
-                return
-        xml_file = None
-        xml_validator = None
-        root = parseXML()
-        generateIndividuals(root)
+                xml_fn = downloadCWE()
+        if sizes:
+                import sizes as size
+                accounting = size.Accounting()
+        if snapshot and subset is not None:
+                print("The snapshot is not used with a subset.")
+                snapshot = False
+        if index and subset is not None:
+                print("The full-text index is not updated with a subset.")
+                index = False
+        model = None
+        if snapshot:
+                import snapshot as snap
+                key = snap.digest(xml_fn, sections, snap.validation(validate, skip_invalid))
+                model = snap.load(key, Weakness, Individual)
+        if model is not None:
+                print("Load entity model from snapshot")
+                root, entries = model
+                writeIndividuals(root, entries, sections)
+        else:
+                root = readCatalog(validate, skip_invalid, processes)
+                if root is None: return
+                if subset is not None:
+                        import subset as selection
+                        selection.select(root, **subset)
+                if pipeline:
+                        import pipeline as pipelined
+                        entries = pipelined.generatePipelined(root, sections, compress = compress)
+                else:
+                        entries = generateIndividuals(root, sections)
+                if snapshot: snap.save(key, root, entries)
+        if sizes:
+                size.writeReport(accounting)
+                accounting = None
+        if closure is not None:
+                import closure as hierarchy
+                hierarchy.writeClosure(entries, closure)
+        if materialize:
+                import reasoner
+                properties = [t for v in root.findall(LS + "Views/" + LS + "View") for t in viewProperties(v.attrib["ID"])]
+                reasoner.writeMaterialized(entries, properties)
+        if columnar is not None:
+                import columnar as export
+                export.writeColumnar(entries, columnar)
+        if shards is not None:
+                import shards as sharding
+                sharding.writeShards(root, entries, shards, references = None if "References" in sections else [])
+        if sqlite:
+                import database
+                database.writeDatabase(entries)
+        if index:
+                import search
+                search.writeIndex(entries)
         print("Generation end")
         end = datetime.now()
         print(end)
@@ -735,5 +910,47 @@ def main(download):
 if __name__ == "__main__":
         parser = argparse.ArgumentParser()
         parser.add_argument('-d', '--download', action="store_true", help='download input from the Web')
+        parser.add_argument('-i', '--input', default=xml_fn, help='CWE List file: .xml, .zip, .xml.gz or .xml.zst')
+        parser.add_argument('-c', '--closure', choices=["ttl", "json"], help='write the transitive closure of the view hierarchies in the format')
+        parser.add_argument('-m', '--materialize', action="store_true", help='materialize the inverse and super property assertions instead of running the reasoner')
+        parser.add_argument('-V', '--validate', choices=["whole", "entries", "none"], help='validate the whole document (default), every entry in parallel or nothing')
+        parser.add_argument('-s', '--skip-invalid', action="store_true", help='generate the valid entries, implies --validate entries')
+        parser.add_argument('-p', '--processes', type=int, help='number of validation processes')
+        parser.add_argument('-t', '--columnar', choices=["parquet", "arrow"], help='export the weakness attributes as columnar tables in the format')
+        parser.add_argument('-S', '--shards', type=int, metavar='N', help='write also the sharded output with N weakness shards')
+        parser.add_argument('-k', '--snapshot', action="store_true", help='load the entity model from the snapshot of the CWE List or save it')
+        parser.add_argument('-q', '--sqlite', action="store_true", help='export the facts as SQLite database')
+        parser.add_argument('-I', '--index', action="store_true", help='update the full-text index of the weaknesses')
+        parser.add_argument('-z', '--sizes', action="store_true", help='report the triples and bytes of the output per predicate, kind and entry')
+        parser.add_argument('-L', '--pipeline', action="store_true", help='overlap extraction, rendering and writing in a pipeline')
+        parser.add_argument('--compress', choices=["gzip", "zst"], help='compress the output of the pipeline')
+        parser.add_argument('--view', help='generate only the view, its members and their closure')
+        parser.add_argument('--ids', help='generate only the comma separated CWE IDs and their closure, e.g. CWE-79,CWE-89')
+        parser.add_argument('--sample', type=int, metavar='N', help='generate only a random sample of N weaknesses and their closure')
+        parser.add_argument('--seed', type=int, default=0, help='seed of the random sample')
+        parser.add_argument('-P', '--profile', default="full", choices=["core", "full", "custom"], help='output profile: the sections of the entries to generate')
+        parser.add_argument('--sections', help='comma separated sections of the custom profile, e.g. Description,Related_Weaknesses,Members')
         args = parser.parse_args()
-        main(args.download)
+        if args.validate is None: args.validate = "entries" if args.skip_invalid else "whole"
+        if args.skip_invalid and args.validate != "entries": parser.error("--skip-invalid requires --validate entries")
+        if args.compress is not None and not args.pipeline: parser.error("--compress requires --pipeline")
+        if args.compress is not None and args.materialize: parser.error("--materialize reads the uncompressed results/cwe.ttl and cannot be used with --compress")
+        if args.pipeline and args.snapshot: parser.error("--pipeline extracts the entries itself and cannot be used with --snapshot")
+        xml_fn = args.input
+        if args.profile == "custom":
+                if args.sections is None: parser.error("the custom profile requires --sections")
+                sections = frozenset(s.strip() for s in args.sections.split(",") if s.strip())
+                unknown = sections - profiles["full"]
+                if unknown: parser.error("unknown sections: " + ", ".join(sorted(unknown)) + "; the sections are: " + ", ".join(sorted(profiles["full"])))
+        else:
+                sections = profiles[args.profile]
+        if args.index:
+                import search
+                missing = search.sections - sections
+                if missing: parser.error("--index requires the indexed sections: " + ", ".join(sorted(missing)))
+        subset = None
+        if args.view is not None or args.ids is not None or args.sample is not None:
+                subset = {"ids": args.ids.split(",") if args.ids else None, "view": args.view, "sample": args.sample, "seed": args.seed}
+        main(args.download, closure = args.closure, materialize = args.materialize, validate = args.validate, skip_invalid = args.skip_invalid, processes = args.processes,
+                columnar = args.columnar, sections = sections, shards = args.shards, snapshot = args.snapshot, sqlite = args.sqlite, index = args.index,
+                sizes = args.sizes, pipeline = args.pipeline, compress = args.compress, subset = subset)
@@ -0,0 +1,133 @@
+"""Pipelined generation of the CWE ontology.
+
+The pipeline overlaps the stages of the generation: the main thread extracts the entries, a rendering thread renders them
+with their individuals as Turtle and a writer thread writes the rendered text, optionally compressed with gzip or zstandard.
+The stages are connected by bounded queues, so the memory is capped and a fast stage waits for the slower one.
+The entries are written in the order of the CWE List. The depth of every queue and the time every stage waits on it are reported.
+"""
+
+import argparse, io, queue, threading, time
+from datetime import datetime
+
+class Channel:
+        """Bounded queue between two stages with depth and stall statistics."""
+        def __init__(self, name, size):
+                self.name = name
+                self.queue = queue.Queue(size)
+                self.items = 0
+                self.depth = 0
+                self.max_depth = 0
+                self.put_stall = 0.0
+                self.get_stall = 0.0
+
+        def put(self, item):
+                d = self.queue.qsize()
+                self.depth += d
+                self.max_depth = max(self.max_depth, d)
+                start = time.perf_counter()
+                self.queue.put(item)
+                self.put_stall += time.perf_counter() - start
+                self.items += 1
+
+        def get(self):
+                start = time.perf_counter()
+                item = self.queue.get()
+                self.get_stall += time.perf_counter() - start
+                return item
+
+        def report(self):
+                return {"items": self.items, "mean_depth": self.depth / self.items if self.items else 0.0, "max_depth": self.max_depth,
+                        "producer_stall": self.put_stall, "consumer_stall": self.get_stall}
+
+def openOutput(fn, compress = None):
+        """Opens the output text file, gzip or zstandard compressed, and returns it with its file name."""
+        if compress == "gzip":
+                import gzip
+                return gzip.open(fn + ".gz", mode='wt', encoding='utf-8'), fn + ".gz"
+        if compress == "zst":
+                import zstandard
+                return io.TextIOWrapper(zstandard.ZstdCompressor().stream_writer(open(fn + ".zst", mode='wb')), encoding='utf-8'), fn + ".zst"
+        return open(fn, mode='w', encoding='utf-8'), fn
+
+def generatePipelined(root, sections = None, fn = "results/cwe.ttl", size = 64, compress = None):
+        """Generates the ontology with the pipeline and returns the entries."""
+        import generateCWEontology as generator
+        from pathlib import Path
+        if sections is None: sections = generator.profiles["full"]
+        print("Processing started")
+        generator.Individual.extend.clear()
+        Path(fn).parent.mkdir(parents=True, exist_ok=True)
+        extracted = Channel("extracted", size)
+        rendered = Channel("rendered", size)
+        errors = list()
+
+        def renderer():
+                while True:
+                        entry = extracted.get()
+                        if entry is None: break
+                        if errors: continue
+                        try:
+                                rendered.put(entry.render())
+                        except Exception as exc:
+                                errors.append(exc)
+                rendered.put(None)
+
+        def writer(out_file):
+                with out_file:
+                        while True:
+                                text = rendered.get()
+                                if text is None: break
+                                if errors: continue
+                                try:
+                                        out_file.write(text)
+                                except Exception as exc:
+                                        errors.append(exc)
+
+        out_file, out_fn = openOutput(fn, compress)
+        shell = io.StringIO()
+        generator.generateShell(root, shell)
+        rendered.put(shell.getvalue())
+        threads = [threading.Thread(target=renderer, name="renderer"), threading.Thread(target=writer, args=(out_file,), name="writer")]
+        for t in threads:
+                t.start()
+        entries = list()
+        start = time.perf_counter()
+        try:
+                for item in root.findall(generator.LS + "Weaknesses/" + generator.LS + "Weakness"):
+                        entries.append(generator.generateWeaknessIndividual(item, sections = sections))
+                        extracted.put(entries[-1])
+                for item in root.findall(generator.LS + "Categories/" + generator.LS + "Category"):
+                        entries.append(generator.generateCategoryIndividual(item, sections = sections))
+                        extracted.put(entries[-1])
+                for item in root.findall(generator.LS + "Views/" + generator.LS + "View"):
+                        entries.append(generator.generateViewIndividual(item, root, sections = sections))
+                        extracted.put(entries[-1])
+                if "References" in sections:
+                        for i in generator.generateExternalReferences(root):
+                                extracted.put(i)
+        finally:
+                extracted.put(None)
+                for t in threads:
+                        t.join()
+        elapsed = time.perf_counter() - start
+        generator.Individual.extend.clear()
+        if errors: raise errors[0]
+        print(f"Pipeline: {len(entries)} entries in {elapsed:.3f} s written to {out_fn}")
+        for c in (extracted, rendered):
+                r = c.report()
+                print(f"\t{c.name}: {r['items']} items, depth mean {r['mean_depth']:.1f} max {r['max_depth']}, producer stall {r['producer_stall']:.3f} s, consumer stall {r['consumer_stall']:.3f} s")
+        print("Processing finished")
+        return entries
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default="results/cwe.ttl", help='ontology file')
+        parser.add_argument('-q', '--queue-size', type=int, default=64, help='capacity of the queues between the stages')
+        parser.add_argument('-z', '--compress', choices=["gzip", "zst"], help='compress the output')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        generatePipelined(generator.parseXML(), fn = args.output, size = args.queue_size, compress = args.compress)
+        print(f"Elapsed: {datetime.now() - start}")
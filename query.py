@@ -0,0 +1,150 @@
+"""CWE ontology query service.
+
+The service loads the entity model of the CWE ontology generator into an in-memory triple store indexed by subject, predicate and object.
+It answers the common questions: children and parents of a CWE within a view, CAPECs and CVEs of a weakness and weaknesses by platform language.
+The loaded store is cached as a pickle snapshot for fast startup. The service is used from the command line or as a local HTTP service.
+"""
+
+import argparse, json, os, pickle
+import generateCWEontology as generator
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import urlparse, parse_qs
+
+snapshot_fn = "results/cwe.pickle"
+
+def entity(cwe):
+        cwe = str(cwe).upper()
+        if not cwe.startswith("CWE-"): cwe = "CWE-" + cwe
+        return ":" + cwe
+
+def literal(value):
+        return "\"" + generator.code(value) + "\""
+
+class TripleStore:
+        def __init__(self):
+                self.spo = dict()
+                self.pos = dict()
+                self.osp = dict()
+                self.source = None
+
+        def add(self, s, p, o):
+                self.spo.setdefault(s, dict()).setdefault(p, set()).add(o)
+                self.pos.setdefault(p, dict()).setdefault(o, set()).add(s)
+                self.osp.setdefault(o, dict()).setdefault(s, set()).add(p)
+
+        def addEntries(self, entries):
+                for e in entries:
+                        for s, p, o in e.triples():
+                                self.add(s, p, o)
+                        for i in e.individuals:
+                                for s, p, o in i.triples():
+                                        self.add(s, p, o)
+
+        def objects(self, s, p):
+                return self.spo.get(s, {}).get(p, set())
+
+        def subjects(self, p, o):
+                return self.pos.get(p, {}).get(o, set())
+
+        def related(self, cwe, view, forward, inverse):
+                s = entity(cwe)
+                r = set()
+                for p in (forward, forward + "-Primary"):
+                        r |= self.objects(s, "cwe-" + str(view) + ":" + p)
+                for p in (inverse, inverse + "-Primary"):
+                        r |= self.subjects("cwe-" + str(view) + ":" + p, s)
+                return sorted(e.lstrip(":") for e in r)
+
+        def parents(self, cwe, view = 1000):
+                return self.related(cwe, view, "ChildOf", "ParentOf")
+
+        def children(self, cwe, view = 1000):
+                return self.related(cwe, view, "ParentOf", "ChildOf")
+
+        def capec(self, cwe):
+                return sorted(e.split(":")[1] for e in self.objects(entity(cwe), ":Related_Attack_Pattern"))
+
+        def cve(self, cwe):
+                r = set()
+                for oe in self.objects(entity(cwe), ":Observed_Example"):
+                        for ref in self.objects(oe, ":Observed_Example_Reference"):
+                                r.add(ref.split(":")[1])
+                return sorted(r)
+
+        def language(self, name):
+                r = set()
+                for ind in self.subjects(":LanguageName", literal(name)):
+                        r |= self.subjects(":Applicable_Platform", ind)
+                return sorted((e.lstrip(":") for e in r), key = lambda e: int(e[4:]))
+
+        def save(self, fn = snapshot_fn):
+                with open(fn, mode='wb') as out_file:
+                        pickle.dump(self.__dict__, out_file, protocol = pickle.HIGHEST_PROTOCOL)
+
+def load(fn = generator.xml_fn, snapshot = snapshot_fn):
+        """Loads the store from the snapshot if it is newer than the CWE List, otherwise from the CWE List."""
+        if snapshot is not None and os.path.exists(snapshot) and os.path.getmtime(snapshot) >= os.path.getmtime(fn):
+                store = TripleStore()
+                with open(snapshot, mode='rb') as in_file:
+                        store.__dict__.update(pickle.load(in_file))
+                if store.source == os.path.abspath(fn): return store
+        generator.xml_fn = fn
+        store = TripleStore()
+        store.source = os.path.abspath(fn)
+        store.addEntries(generator.extractEntries(generator.parseXML()))
+        if snapshot is not None:
+                os.makedirs(os.path.dirname(snapshot) or ".", exist_ok = True)
+                store.save(snapshot)
+        return store
+
+def answer(store, question, argument, view = 1000):
+        if question == "parents": return store.parents(argument, view)
+        if question == "children": return store.children(argument, view)
+        if question == "capec": return store.capec(argument)
+        if question == "cve": return store.cve(argument)
+        if question == "language": return store.language(argument)
+        raise ValueError("Unknown question: " + question)
+
+def serve(store, port):
+        class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                        url = urlparse(self.path)
+                        query = parse_qs(url.query)
+                        try:
+                                r = answer(store, url.path.strip("/"), query["id"][0], query.get("view", ["1000"])[0])
+                                status = 200
+                        except (KeyError, ValueError) as exc:
+                                r = {"error": str(exc)}
+                                status = 400
+                        body = json.dumps(r).encode('UTF-8')
+                        self.send_response(status)
+                        self.send_header("Content-Type", "application/json")
+                        self.send_header("Content-Length", str(len(body)))
+                        self.end_headers()
+                        self.wfile.write(body)
+
+        print(f"Serving on http://localhost:{port}/")
+        HTTPServer(("localhost", port), Handler).serve_forever()
+
+if __name__ == "__main__":
+        parser = argparse.ArgumentParser()
+        parser.add_argument('question', nargs='?', choices=["parents", "children", "capec", "cve", "language"], help='question to answer')
+        parser.add_argument('argument', nargs='?', help='CWE ID or language name')
+        parser.add_argument('-v', '--view', default="1000", help='view of the parents and children questions')
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-s', '--serve', type=int, metavar='PORT', help='serve the questions over HTTP on the port')
+        parser.add_argument('--no-snapshot', action="store_true", help='do not use the snapshot file')
+        args = parser.parse_args()
+        if args.serve is None and (args.question is None or args.argument is None): parser.error("a question and its argument are required without --serve")
+        start = datetime.now()
+        store = load(args.input, None if args.no_snapshot else snapshot_fn)
+        print(f"Loaded: {datetime.now() - start}")
+        if args.serve is not None:
+                serve(store, args.serve)
+        else:
+                start = datetime.now()
+                r = answer(store, args.question, args.argument, args.view)
+                end = datetime.now()
+                print("\n".join(r))
+                print(f"Elapsed: {end - start}")
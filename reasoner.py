@@ -0,0 +1,108 @@
+"""Lightweight materializer of the CWE ontology object property assertions.
+
+The materializer replaces the HermiT run of "robot.bat" for the OWL subset the generator emits:
+owl:inverseOf and rdfs:subPropertyOf between object properties, both the per view properties of the generator and the properties of "shell.ttl".
+It forward chains the property assertions of the entity model and appends the inferred assertions to a copy of "results/cwe.ttl" as "results/cweR.ttl".
+owl:InverseFunctionalProperty does not entail property assertions and it is not materialized.
+"""
+
+import argparse, re, shutil
+from datetime import datetime
+
+object_property = re.compile(r"^(:\w+) rdf:type owl:ObjectProperty(.*?) \.$", re.M | re.S)
+
+class PropertyTable:
+        def __init__(self):
+                self.supers = dict()
+                self.inverses = dict()
+
+        def add(self, p, sp = None, inv = None):
+                self.supers.setdefault(p, set())
+                self.inverses.setdefault(p, set())
+                if sp is not None:
+                        self.supers[p].add(sp)
+                        self.add(sp)
+                if inv is not None:
+                        self.inverses[p].add(inv)
+                        self.add(inv)
+                        self.inverses[inv].add(p)
+
+        def addShell(self, fn = "shell.ttl"):
+                with open(fn, mode='r', encoding='utf-8') as in_file:
+                        shell = in_file.read()
+                for m in object_property.finditer(shell):
+                        self.add(m.group(1))
+                        for sp in re.findall(r"rdfs:subPropertyOf (:\w+)", m.group(2)):
+                                self.add(m.group(1), sp = sp)
+                        for inv in re.findall(r"owl:inverseOf (:\w+)", m.group(2)):
+                                self.add(m.group(1), inv = inv)
+
+        def addViews(self, properties):
+                for p, sp, inv, ifp in properties:
+                        self.add(p, sp = sp, inv = inv)
+
+        def superClosure(self):
+                """Returns a dictionary property -> the property and all its super properties."""
+                closure = dict()
+                for p in self.supers:
+                        seen = {p}
+                        stack = [p]
+                        while stack:
+                                for sp in self.supers[stack.pop()]:
+                                        if sp not in seen:
+                                                seen.add(sp)
+                                                stack.append(sp)
+                        closure[p] = seen
+                return closure
+
+def assertions(entries):
+        for e in entries:
+                yield from e.triples()
+                for i in e.individuals:
+                        yield from i.triples()
+
+def materialize(entries, table):
+        """Returns the set of property assertions entailed by the entity model and not asserted in it."""
+        supers = table.superClosure()
+        asserted = set()
+        inferred = set()
+        work = list()
+        for s, p, o in assertions(entries):
+                if p in supers:
+                        asserted.add((s, p, o))
+                        work.append((s, p, o))
+        while work:
+                s, p, o = work.pop()
+                for sp in supers[p]:
+                        for t in [(s, sp, o)] + [(o, inv, s) for inv in table.inverses[sp]]:
+                                if t not in asserted and t not in inferred:
+                                        inferred.add(t)
+                                        work.append(t)
+        return inferred
+
+def writeMaterialized(entries, properties, shell_fn = "shell.ttl", fn_in = "results/cwe.ttl", fn = "results/cweR.ttl"):
+        print("Materialize property assertions")
+        table = PropertyTable()
+        table.addShell(shell_fn)
+        table.addViews(properties)
+        inferred = materialize(entries, table)
+        shutil.copyfile(fn_in, fn)
+        with open(fn, mode='a', encoding='utf-8') as out_file:
+                for s, p, o in sorted(inferred):
+                        out_file.write("\n" + s + " " + p + " " + o + " .")
+                out_file.write("\n")
+        print(f"Inferred assertions: {len(inferred)}")
+        return inferred
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default="results/cweR.ttl", help='materialized ontology file')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        root = generator.parseXML()
+        properties = [t for v in root.findall(generator.LS + "Views/" + generator.LS + "View") for t in generator.viewProperties(v.attrib["ID"])]
+        writeMaterialized(generator.extractEntries(root), properties, fn = args.output)
+        print(f"Elapsed: {datetime.now() - start}")
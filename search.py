@@ -0,0 +1,128 @@
+"""Full-text search of the CWE entries.
+
+The index is an inverted index of the text the generator extracts: weakness descriptions, extended descriptions, background details,
+observed example descriptions and demonstrative example code. Every entry is a document and every term has a postings list of
+document IDs and term frequencies stored as compact integer arrays in "results/cwe.index". The queries are ranked with BM25.
+The index is updated incrementally: only the entries with changed text are tokenized again.
+Every update takes the whole CWE List and removes the missing entries, so it is generated with all the indexed sections and without a subset.
+"""
+
+import argparse, hashlib, math, os, pickle, re
+from array import array
+from datetime import datetime
+from generateCWEontology import uncode
+
+index_fn = "results/cwe.index"
+sections = frozenset(("Description", "Extended_Description", "Background_Details", "Observed_Examples", "Demonstrative_Examples"))
+entry_fields = ("Weakness_Description", "Extended_Description", "Background_Detail")
+individual_fields = ("Observed_Example_Description", "Structured_Code")
+token = re.compile(r"[a-z0-9_]{2,}")
+markup = re.compile(r"<[^>]*>")
+
+def tokenize(text):
+        return token.findall(markup.sub(" ", text).lower())
+
+def documentText(entry):
+        texts = list()
+        for f in entry_fields:
+                texts.extend(sorted(entry.annotations.get(f, ())))
+        for ind in entry.individuals:
+                for f in individual_fields:
+                        texts.extend(sorted(ind.annotations.get(f, ())))
+        return uncode("\n".join(texts))
+
+class Index:
+        def __init__(self):
+                self.docs = dict()
+                self.postings = dict()
+                self.k1 = 1.2
+                self.b = 0.75
+
+        def update(self, documents):
+                """Updates the index with a dictionary CWE ID -> text of all documents and returns the number of tokenized documents."""
+                hashes = {ID: hashlib.sha1(text.encode('UTF-8')).hexdigest() for ID, text in documents.items()}
+                changed = {ID for ID in self.docs if ID not in hashes or self.docs[ID][1] != hashes[ID]}
+                added = [ID for ID in sorted(hashes) if ID not in self.docs or ID in changed]
+                if changed:
+                        for term in list(self.postings):
+                                ids, tfs = self.postings[term]
+                                keep = [i for i, ID in enumerate(ids) if ID not in changed]
+                                if len(keep) == len(ids): continue
+                                if keep:
+                                        self.postings[term] = (array('I', (ids[i] for i in keep)), array('I', (tfs[i] for i in keep)))
+                                else:
+                                        del self.postings[term]
+                        for ID in changed:
+                                del self.docs[ID]
+                for ID in added:
+                        terms = tokenize(documents[ID])
+                        tf = dict()
+                        for t in terms:
+                                tf[t] = tf.get(t, 0) + 1
+                        for t, n in tf.items():
+                                ids, tfs = self.postings.setdefault(t, (array('I'), array('I')))
+                                ids.append(ID)
+                                tfs.append(n)
+                        self.docs[ID] = (len(terms), hashes[ID])
+                return len(added)
+
+        def search(self, query, top = 10):
+                """Returns the list of (score, CWE ID) of the best ranked documents."""
+                n = len(self.docs)
+                if n == 0: return []
+                avgdl = sum(l for l, h in self.docs.values()) / n
+                scores = dict()
+                for t in set(tokenize(query)):
+                        if t not in self.postings: continue
+                        ids, tfs = self.postings[t]
+                        idf = math.log(1 + (n - len(ids) + 0.5) / (len(ids) + 0.5))
+                        for ID, tf in zip(ids, tfs):
+                                dl = self.docs[ID][0]
+                                scores[ID] = scores.get(ID, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * dl / avgdl))
+                return sorted(((s, "CWE-" + str(ID)) for ID, s in scores.items()), key = lambda r: (-r[0], r[1]))[:top]
+
+        def save(self, fn = index_fn):
+                os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+                with open(fn, mode='wb') as out_file:
+                        pickle.dump((self.docs, self.postings), out_file, protocol = 5)
+
+def load(fn = index_fn):
+        index = Index()
+        if os.path.exists(fn):
+                with open(fn, mode='rb') as in_file:
+                        index.docs, index.postings = pickle.load(in_file)
+        return index
+
+def writeIndex(entries, fn = index_fn):
+        print("Update full-text index")
+        index = load(fn)
+        documents = {int(e.element.attrib["ID"]): documentText(e) for e in entries if e.element.tag.endswith("}Weakness")}
+        count = index.update(documents)
+        index.save(fn)
+        print(f"Indexed entries: {count} of {len(documents)}, terms: {len(index.postings)}")
+        return index
+
+if __name__ == "__main__":
+        parser = argparse.ArgumentParser()
+        parser.add_argument('query', nargs='*', help='query terms')
+        parser.add_argument('-n', '--top', type=int, default=10, help='number of results')
+        parser.add_argument('-x', '--index', default=index_fn, help='index file')
+        parser.add_argument('-u', '--update', action="store_true", help='update the index from the CWE List before the query')
+        parser.add_argument('-i', '--input', help='CWE List file of the update')
+        args = parser.parse_args()
+        if args.update:
+                import generateCWEontology as generator
+                start = datetime.now()
+                if args.input is not None: generator.xml_fn = args.input
+                writeIndex(generator.extractEntries(generator.parseXML()), args.index)
+                print(f"Elapsed: {datetime.now() - start}")
+        if args.query:
+                start = datetime.now()
+                index = load(args.index)
+                loaded = datetime.now()
+                results = index.search(" ".join(args.query), args.top)
+                end = datetime.now()
+                for score, ID in results:
+                        print(f"{ID}\t{score:.3f}")
+                print(f"Loaded: {loaded - start}")
+                print(f"Elapsed: {end - loaded}")
@@ -0,0 +1,81 @@
+"""Sharded output of the CWE ontology.
+
+The ontology is split into independently loadable Turtle files in "results/shards": the shell with the TBox, the weaknesses in N ranges of CWE IDs,
+the categories, the views and the external references. The individuals of an entry (consequences, mitigations, examples, ...) are written
+in the shard of the entry. Every shard repeats the prefix header, so every shard is valid standalone Turtle and the shards can be loaded in parallel.
+The shards are listed in "manifest.json".
+"""
+
+import argparse, io, json, os
+from datetime import datetime
+
+def header(shell):
+        """Returns the prefix and base declarations of the rendered shell."""
+        return "".join(l for l in shell.splitlines(True) if l.startswith("@"))
+
+def ranges(items, count):
+        """Splits the items into at most count contiguous ranges of equal size, no range for no items."""
+        if not items: return []
+        count = max(1, min(count, len(items)))
+        size, rest = divmod(len(items), count)
+        r = list()
+        start = 0
+        for i in range(count):
+                end = start + size + (1 if i < rest else 0)
+                r.append(items[start:end])
+                start = end
+        return r
+
+def writeShards(root, entries, count = 4, path = "results/shards", references = None):
+        """Writes the shards of the entity model and returns the manifest.
+        references is the list of the external reference individuals, they are generated from root when it is None."""
+        import generateCWEontology as generator
+        print("Generate shards")
+        os.makedirs(path, exist_ok = True)
+        out = io.StringIO()
+        generator.generateShell(root, out)
+        shell = out.getvalue()
+        prefixes = header(shell)
+        if references is None:
+                references = generator.generateExternalReferences(root)
+                generator.Individual.extend.clear()
+        kinds = {"Weakness": list(), "Category": list(), "View": list()}
+        for e in entries:
+                kinds[e.element.tag.rsplit("}", 1)[-1]].append(e)
+        manifest = {"catalog": {k: root.attrib.get(k) for k in ("Name", "Version", "Date")}, "shards": list()}
+
+        def write(name, kind, body, ids = ()):
+                fn = name + ".ttl"
+                with open(os.path.join(path, fn), mode='w', encoding='utf-8') as out_file:
+                        out_file.write(body if kind == "shell" else prefixes + body + "\n")
+                shard = {"file": fn, "kind": kind, "entries": len(ids), "bytes": os.path.getsize(os.path.join(path, fn))}
+                if ids: shard.update({"first": ids[0], "last": ids[-1]})
+                manifest["shards"].append(shard)
+
+        write("shell", "shell", shell)
+        weaknesses = sorted(kinds["Weakness"], key = lambda e: int(e.element.attrib["ID"]))
+        for r in ranges(weaknesses, count):
+                ids = ["CWE-" + e.element.attrib["ID"] for e in r]
+                write("weaknesses-" + r[0].element.attrib["ID"] + "-" + r[-1].element.attrib["ID"], "weaknesses", "".join(e.render() for e in r), ids)
+        for kind, name in (("Category", "categories"), ("View", "views")):
+                r = sorted(kinds[kind], key = lambda e: int(e.element.attrib["ID"]))
+                write(name, name, "".join(e.render() for e in r), ["CWE-" + e.element.attrib["ID"] for e in r])
+        refs = sorted(references, key = lambda i: i.name)
+        write("references", "references", "".join(i.tostring() for i in refs), [i.name for i in refs])
+        with open(os.path.join(path, "manifest.json"), mode='w', encoding='utf-8') as out_file:
+                json.dump(manifest, out_file, indent = 1)
+        print(f"Shards: {len(manifest['shards'])}")
+        return manifest
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-n', '--count', type=int, default=4, help='number of weakness shards')
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default="results/shards", help='shard directory')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        root = generator.parseXML()
+        writeShards(root, generator.extractEntries(root), args.count, args.output)
+        print(f"Elapsed: {datetime.now() - start}")
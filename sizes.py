@@ -0,0 +1,137 @@
+"""Output size accounting of the CWE ontology.
+
+While the generator writes "results/cwe.ttl" the writer path records the triples and bytes of the output per predicate,
+per entity kind (weakness, category, view, individual types, shell) and per CWE ID (the individuals count for their CWE).
+The statements of the shell template (the TBox) are counted with a small Turtle statement reader.
+The report "results/sizes.json" holds the totals, all predicates and kinds, the heaviest entries and the differences
+against the report of the previous run, so the growth of the output after a new CWE release is visible at once.
+"""
+
+import json, os, re
+
+report_fn = "results/sizes.json"
+token = re.compile(r'"""(?:[^"\\]|\\.|"(?!""))*"""|"(?:[^"\\\n]|\\.)*"|<[^>]*>|#[^\n]*|[;,.\[\]()]|[^\s;,.\[\]()"<#]+(?:\.[^\s;,.\[\]()"<#]+)*')
+
+def templateTriples(text):
+        """Returns the triples of a Turtle template as (subject, predicate, object) with the names as written and the blank nodes as "[]"."""
+        tokens = [t for t in token.findall(text) if not t.startswith("#")]
+        triples = list()
+        pos = 0
+
+        def term():
+                nonlocal pos
+                t = tokens[pos]
+                pos += 1
+                if t == "[":
+                        if tokens[pos] != "]": properties("[]")
+                        pos += 1
+                        return "[]"
+                if t == "(":
+                        items = list()
+                        while tokens[pos] != ")": items.append(term())
+                        pos += 1
+                        for i, item in enumerate(items):
+                                triples.append(("[]", "rdf:first", item))
+                                triples.append(("[]", "rdf:rest", "[]" if i < len(items) - 1 else "rdf:nil"))
+                        return "[]" if items else "rdf:nil"
+                if t.startswith('"'):
+                        while pos < len(tokens) and tokens[pos][0] in "@^":
+                                t += tokens[pos]
+                                pos += 1
+                return t
+
+        def properties(s):
+                nonlocal pos
+                while True:
+                        p = tokens[pos]
+                        pos += 1
+                        if p == "a": p = "rdf:type"
+                        triples.append((s, p, term()))
+                        while tokens[pos] == ",":
+                                pos += 1
+                                triples.append((s, p, term()))
+                        if tokens[pos] != ";": return
+                        while tokens[pos] == ";": pos += 1
+                        if tokens[pos] in (".", "]"): return
+
+        while pos < len(tokens):
+                if tokens[pos] in ("@prefix", "@base"):
+                        while tokens[pos] != ".": pos += 1
+                        pos += 1
+                        continue
+                s = term()
+                if tokens[pos] != ".": properties(s)
+                pos += 1
+        return triples
+
+class Accounting:
+        def __init__(self):
+                self.predicates = dict()
+                self.kinds = dict()
+                self.entries = dict()
+                self.triples = 0
+                self.bytes = 0
+
+        def record(self, kind, owner, triples, text):
+                """Records the rendered text of an entity of the kind and of the owner and its triples."""
+                size = len(text.encode('UTF-8'))
+                for s, p, o in triples:
+                        c = self.predicates.setdefault(p, [0, 0])
+                        c[0] += 1
+                        c[1] += len(p.encode('UTF-8')) + len(o.encode('UTF-8')) + 4
+                for d, key in ((self.kinds, kind), (self.entries, owner)):
+                        c = d.setdefault(key, [0, 0])
+                        c[0] += len(triples)
+                        c[1] += size
+                self.triples += len(triples)
+                self.bytes += size
+
+        def recordTemplate(self, kind, owner, text):
+                """Records a Turtle template, e.g. the shell, with the triples of its statements."""
+                self.record(kind, owner, templateTriples(text), text)
+
+        def report(self, top = 20):
+                def table(d, n = None):
+                        items = sorted(d.items(), key = lambda i: (-i[1][1], i[0]))
+                        if n is not None: items = items[:n]
+                        return {k: {"triples": c[0], "bytes": c[1]} for k, c in items}
+
+                return {"total": {"triples": self.triples, "bytes": self.bytes},
+                        "kinds": table(self.kinds),
+                        "predicates": table(self.predicates),
+                        "entries": table(self.entries, top)}
+
+def diff(report, previous):
+        """Returns the differences of the triples and bytes of the report against the previous report."""
+        def delta(new, old):
+                return {"triples": new.get("triples", 0) - old.get("triples", 0), "bytes": new.get("bytes", 0) - old.get("bytes", 0)}
+
+        r = {"total": delta(report["total"], previous.get("total", {}))}
+        for section in ("kinds", "predicates", "entries"):
+                new, old = report[section], previous.get(section, {})
+                changes = dict()
+                for k in sorted(set(new) | set(old)):
+                        d = delta(new.get(k, {}), old.get(k, {}))
+                        if d["triples"] or d["bytes"]: changes[k] = d
+                r[section] = dict(sorted(changes.items(), key = lambda i: (-abs(i[1]["bytes"]), i[0])))
+        return r
+
+def writeReport(accounting, fn = report_fn, top = 20):
+        print("Generate size report")
+        report = accounting.report(top)
+        previous = None
+        if os.path.exists(fn):
+                with open(fn, mode='r', encoding='utf-8') as in_file:
+                        previous = json.load(in_file).get("report")
+        r = {"report": report}
+        if previous is not None: r["diff"] = diff(report, previous)
+        os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+        with open(fn, mode='w', encoding='utf-8') as out_file:
+                json.dump(r, out_file, indent = 1)
+        print(f"Triples: {report['total']['triples']}, bytes: {report['total']['bytes']}")
+        for k, c in list(report["predicates"].items())[:5]:
+                print(f"\t{k}: {c['triples']} triples, {c['bytes']} bytes")
+        if previous is not None:
+                d = r["diff"]["total"]
+                print(f"Change since the previous run: {d['triples']:+} triples, {d['bytes']:+} bytes")
+        return r
@@ -0,0 +1,99 @@
+"""Binary snapshot of the entity model of the CWE ontology generator.
+
+The snapshot keeps the extracted entries (types, annotations, data facts, object facts and individuals of every weakness, category and view)
+and a skeleton of the catalog (its attributes, the views and the external references) as a pickle of protocol 5 in "results/cwe.snapshot".
+The snapshot is keyed by the hash of the CWE List file, the generated sections and the validation of the CWE List,
+so a later run with the same input loads the entity model from the snapshot and skips the XML parsing and the extraction,
+while a run with another validation does not load it: a validated run does not load a model saved without validation or without the skipped invalid entries.
+"""
+
+import argparse, hashlib, os, pickle
+import xml.etree.ElementTree as etree
+from datetime import datetime
+
+LS = "{http://cwe.mitre.org/cwe-6}"
+snapshot_fn = "results/cwe.snapshot"
+version = 1
+
+def digest(fn, sections, validation = "none"):
+        """Returns the key of the snapshot of the CWE List file generated with the sections and validated with the validation,
+        e.g. "whole", "entries", "entries-skip-invalid" or "none"."""
+        h = hashlib.sha256()
+        with open(fn, mode='rb') as in_file:
+                for chunk in iter(lambda: in_file.read(1 << 20), b""):
+                        h.update(chunk)
+        h.update(("\n" + str(version) + "\n" + validation + "\n" + "\n".join(sorted(sections))).encode('UTF-8'))
+        return h.hexdigest()
+
+def validation(validate, skip_invalid = False):
+        """Returns the validation of the snapshot key for the validation mode of readCatalog."""
+        return validate + ("-skip-invalid" if skip_invalid and validate == "entries" else "")
+
+def skeleton(root):
+        """Returns a copy of the catalog with its attributes, the attributes of the views and the external references."""
+        s = etree.Element(root.tag, dict(root.attrib))
+        for container in root:
+                c = etree.SubElement(s, container.tag, dict(container.attrib))
+                if container.tag == LS + "External_References":
+                        c.extend(list(container))
+                elif container.tag == LS + "Views":
+                        for view in container:
+                                etree.SubElement(c, view.tag, dict(view.attrib))
+        return s
+
+def save(key, root, entries, fn = snapshot_fn):
+        model = list()
+        for e in entries:
+                state = dict(e.__dict__)
+                state["element"] = etree.Element(e.element.tag, dict(e.element.attrib))
+                state["individuals"] = [i.__dict__ for i in e.individuals]
+                model.append(state)
+        os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+        with open(fn, mode='wb') as out_file:
+                pickle.dump(key, out_file, protocol = 5)
+                pickle.dump((skeleton(root), model), out_file, protocol = 5)
+
+def load(key, weakness, individual, fn = snapshot_fn):
+        """Returns the catalog skeleton and the entries of the snapshot with the key or None.
+        weakness and individual are the classes of the entries and of their individuals."""
+        if not os.path.exists(fn): return None
+        with open(fn, mode='rb') as in_file:
+                if pickle.load(in_file) != key: return None
+                root, model = pickle.load(in_file)
+        entries = list()
+        for state in model:
+                e = object.__new__(weakness)
+                e.__dict__.update(state)
+                individuals = list()
+                for istate in state["individuals"]:
+                        i = object.__new__(individual)
+                        i.__dict__.update(istate)
+                        individuals.append(i)
+                e.individuals = individuals
+                entries.append(e)
+        return root, entries
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default=snapshot_fn, help='snapshot file')
+        parser.add_argument('-P', '--profile', default="full", choices=["core", "full"], help='output profile: the sections of the entries to generate')
+        parser.add_argument('-V', '--validate', choices=["whole", "entries", "none"], help='validate the whole document (default), every entry in parallel or nothing, as the generator run that loads the snapshot')
+        parser.add_argument('-s', '--skip-invalid', action="store_true", help='save the valid entries, implies --validate entries')
+        parser.add_argument('-p', '--processes', type=int, help='number of validation processes')
+        args = parser.parse_args()
+        if args.validate is None: args.validate = "entries" if args.skip_invalid else "whole"
+        if args.skip_invalid and args.validate != "entries": parser.error("--skip-invalid requires --validate entries")
+        start = datetime.now()
+        generator.xml_fn = args.input
+        sections = generator.profiles[args.profile]
+        key = digest(args.input, sections, validation(args.validate, args.skip_invalid))
+        if load(key, generator.Weakness, generator.Individual, args.output) is not None:
+                print("Snapshot is current.")
+        else:
+                root = generator.readCatalog(args.validate, args.skip_invalid, args.processes)
+                if root is not None:
+                        save(key, root, generator.extractEntries(root, sections), args.output)
+                        print("Snapshot saved.")
+        print(f"Elapsed: {datetime.now() - start}")
@@ -0,0 +1,49 @@
+"""Startup benchmark of the command line tools.
+
+The benchmark runs short invocations in fresh interpreters with "-X importtime" and reports the wall clock time of every invocation
+and the modules with the largest cumulative import time, so regressions of the startup time are visible.
+"""
+
+import argparse, subprocess, sys, time
+
+invocations = {"cpe": "import cpe; cpe.convert_fs_to_compressed_uri('cpe:2.3:a:microsoft:internet_explorer:8.0.6001:beta:*:*:*:*:*:*')",
+        "cpe-language": "import cpe; cpe.convert_fs_to_compressed_uri('cpe:2.3:a:hp:insight_diagnostics:7.4.0.1570:-:*:en-us:online:win2003:x64:*')",
+        "generator": "import generateCWEontology",
+        "generator-help": "import sys, runpy; sys.argv = ['generateCWEontology.py', '--help']; runpy.run_path('generateCWEontology.py', run_name='__main__')"}
+
+def importTimes(stderr):
+        """Returns a list of (cumulative microseconds, module) of the top level imports of the importtime report."""
+        r = list()
+        for line in stderr.splitlines():
+                if not line.startswith("import time:") or "|" not in line: continue
+                self_us, cumulative, name = line[len("import time:"):].split("|")
+                if not cumulative.strip().isdigit(): continue
+                if name.startswith("  "): continue
+                r.append((int(cumulative), name.strip()))
+        return sorted(r, reverse = True)
+
+def run(code, repeat = 5):
+        """Returns the best wall clock time in seconds of the invocation and the import times of its last run."""
+        best = None
+        stderr = ""
+        for i in range(repeat):
+                start = time.perf_counter()
+                p = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output = True, text = True)
+                elapsed = time.perf_counter() - start
+                stderr = p.stderr
+                if best is None or elapsed < best: best = elapsed
+        return best, importTimes(stderr)
+
+if __name__ == "__main__":
+        parser = argparse.ArgumentParser()
+        parser.add_argument('invocation', nargs='*', help='invocations to measure, all by default: ' + ', '.join(invocations))
+        parser.add_argument('-r', '--repeat', type=int, default=5, help='number of runs of every invocation')
+        parser.add_argument('-n', '--top', type=int, default=5, help='number of the slowest imports to report')
+        args = parser.parse_args()
+        unknown = set(args.invocation) - set(invocations)
+        if unknown: parser.error("unknown invocations: " + ", ".join(sorted(unknown)))
+        for name in args.invocation or invocations:
+                best, imports = run(invocations[name], args.repeat)
+                print(f"{name}: {best * 1000:.1f} ms")
+                for us, module in imports[:args.top]:
+                        print(f"\t{us / 1000:8.1f} ms {module}")
@@ -0,0 +1,89 @@
+"""Subset selection of the CWE List.
+
+The selection keeps the requested entries of the parsed CWE List, a view, a list of CWE IDs or a random sample of weaknesses,
+and the closure of the entries they reference with Related_Weaknesses, Relationships and Members (Has_Member and Member_Of).
+The views referenced only by the View_ID of a kept relationship are kept without their members and filter,
+so the ontology generated from the subset is self-contained.
+The members of a view defined only by its filter are not selected by the view.
+"""
+
+import argparse, random
+from datetime import datetime
+
+LS = "{http://cwe.mitre.org/cwe-6}"
+containers = {"Weaknesses": "Weakness", "Categories": "Category", "Views": "View"}
+paths = [LS + "Related_Weaknesses/" + LS + "Related_Weakness", LS + "Relationships/*", LS + "Members/*"]
+
+def entryID(ID):
+        ID = str(ID).strip().upper()
+        return ID[4:] if ID.startswith("CWE-") else ID
+
+def references(item):
+        """Yields the (CWE ID, view ID) of the relationships of an entry."""
+        for path in paths:
+                for e in item.findall(path):
+                        if "CWE_ID" in e.attrib: yield e.attrib["CWE_ID"], e.attrib.get("View_ID")
+
+def closure(entries, start):
+        """Returns the IDs of the entries reachable from the start IDs and the IDs of the views referenced by them."""
+        keep = set()
+        views = set()
+        stack = [ID for ID in start if ID in entries]
+        while stack:
+                ID = stack.pop()
+                if ID in keep: continue
+                keep.add(ID)
+                for r, view in references(entries[ID]):
+                        if view is not None: views.add(view)
+                        if r in entries and r not in keep: stack.append(r)
+        return keep, views
+
+def select(root, ids = None, view = None, sample = None, seed = 0):
+        """Removes from the parsed CWE List the entries outside the selection and its closure and returns the IDs of the kept entries."""
+        entries = dict()
+        for container, tag in containers.items():
+                for item in root.findall(LS + container + "/" + LS + tag):
+                        entries[item.attrib["ID"]] = item
+        start = set()
+        if ids:
+                start |= {entryID(ID) for ID in ids}
+        if view is not None:
+                view = entryID(view)
+                start.add(view)
+                for ID, item in entries.items():
+                        if any(v == view for r, v in references(item)): start.add(ID)
+        if sample:
+                weaknesses = sorted(item.attrib["ID"] for item in root.findall(LS + "Weaknesses/" + LS + "Weakness"))
+                start |= set(random.Random(seed).sample(weaknesses, min(sample, len(weaknesses))))
+        missing = {ID for ID in start if ID not in entries}
+        if missing: print("Unknown entries: " + ", ".join("CWE-" + ID for ID in sorted(missing)))
+        keep, views = closure(entries, start)
+        for container, tag in containers.items():
+                c = root.find(LS + container)
+                if c is None: continue
+                for item in c.findall(LS + tag):
+                        ID = item.attrib["ID"]
+                        if ID in keep: continue
+                        if tag == "View" and ID in views:
+                                for e in item.findall(LS + "Members") + item.findall(LS + "Filter"):
+                                        item.remove(e)
+                        else:
+                                c.remove(item)
+        print(f"Selected entries: {len(keep)} of {len(entries)}")
+        return keep
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('--view', help='select the view and its members')
+        parser.add_argument('--ids', help='select the comma separated CWE IDs')
+        parser.add_argument('--sample', type=int, help='select a random sample of N weaknesses')
+        parser.add_argument('--seed', type=int, default=0, help='seed of the random sample')
+        args = parser.parse_args()
+        start = datetime.now()
+        generator.xml_fn = args.input
+        root = generator.parseXML()
+        keep = select(root, args.ids.split(",") if args.ids else None, args.view, args.sample, args.seed)
+        print(", ".join("CWE-" + ID for ID in sorted(keep, key = int)))
+        print(f"Elapsed: {datetime.now() - start}")
@@ -0,0 +1,23 @@
+"""Generation of the CAPEC ontology from the bundled sample CAPEC List."""
+
+from pathlib import Path
+import pytest
+import generateCWE_CAPEContology as capec
+
+rdflib = pytest.importorskip("rdflib")
+root_dir = Path(__file__).resolve().parent.parent
+CAPEC = rdflib.Namespace("http://www.semanticweb.org/capec#")
+CWE = rdflib.Namespace("http://www.semanticweb.org/cwe#")
+
+def test_sample(tmp_path, monkeypatch):
+        monkeypatch.chdir(root_dir)
+        fn = tmp_path / "capec.ttl"
+        assert capec.generateIndividuals("data/capec_sample.xml", str(fn)) == 5
+        g = rdflib.Graph()
+        g.parse(str(fn), format='turtle')
+        patterns = set(g.subjects(rdflib.RDF.type, CAPEC.CAPEC))
+        assert patterns == {CAPEC["CAPEC-" + ID] for ID in ("63", "66", "242", "248", "470")}
+        assert set(g.subject_objects(CAPEC.Related_Weakness)) == {(CAPEC["CAPEC-" + a], CWE["CWE-" + w])
+                for a, w in (("63", "79"), ("63", "20"), ("66", "89"), ("242", "94"), ("248", "77"), ("470", "250"))}
+        assert set(g.subject_objects(CAPEC.ChildOf)) == {(CAPEC["CAPEC-63"], CAPEC["CAPEC-242"]), (CAPEC["CAPEC-66"], CAPEC["CAPEC-248"])}
+        assert set(g.subject_objects(CAPEC.ParentOf)) == {(CAPEC["CAPEC-242"], CAPEC["CAPEC-63"]), (CAPEC["CAPEC-248"], CAPEC["CAPEC-66"])}
@@ -0,0 +1,35 @@
+"""Comparison of the materializer with an independently computed closure of the property assertions.
+
+The expected assertions are the rdfs:subPropertyOf and owl:inverseOf closure of the sample ontology computed with rdflib, not a HermiT cweR.ttl.
+Unverified against HermiT: the other entailments of its PropertyAssertion generator (e.g. from owl:sameAs or property characteristics
+added to shell.ttl later) and its output format; a HermiT cweR.ttl of the sample can replace the fixture, the comparison reads any Turtle.
+"""
+
+from pathlib import Path
+import pytest
+import generateCWEontology as generator
+import reasoner
+
+rdflib = pytest.importorskip("rdflib")
+root_dir = Path(__file__).resolve().parent.parent
+data = Path(__file__).resolve().parent / "data"
+
+def expected(fn = data / "closure_sample.ttl"):
+        """Returns the object property assertions of a Turtle file in the prefixed names of the generator."""
+        g = rdflib.Graph()
+        g.parse(str(fn), format='turtle')
+        return {tuple(x.n3(g.namespace_manager) for x in t) for t in g if isinstance(t[2], rdflib.URIRef)}
+
+def test_materialize_matches_closure():
+        with generator.openCatalog(str(data / "cwec_sample.xml")) as in_file:
+                root = generator.etree.parse(in_file).getroot()
+        entries = generator.extractEntries(root)
+        table = reasoner.PropertyTable()
+        table.addShell(str(root_dir / "shell.ttl"))
+        table.addViews([t for v in root.findall(generator.LS + "Views/" + generator.LS + "View") for t in generator.viewProperties(v.attrib["ID"])])
+        asserted = {t for t in reasoner.assertions(entries) if t[1] in table.supers}
+        inferred = reasoner.materialize(entries, table)
+        closure = {t for t in expected() if t[1] in table.supers}
+        assert not inferred & asserted
+        assert asserted | inferred == closure
+        generator.Individual.extend.clear()
@@ -0,0 +1,148 @@
+"""Ranking of candidate CWEs for CVE descriptions.
+
+The ranking builds a sparse TF-IDF matrix of the weakness text the generator extracts (the name and the text of the full-text index)
+and ranks the weaknesses of a batch of CVE descriptions by cosine similarity with one sparse matrix multiplication per block of descriptions.
+The fitted vocabulary, IDF weights and weakness matrix are cached in "results/triage.npz" keyed by the hash of the CWE List.
+The ranking requires NumPy and SciPy.
+"""
+
+import argparse, os, sys
+from datetime import datetime
+from search import documentText, tokenize
+from generateCWEontology import uncode
+
+model_fn = "results/triage.npz"
+
+class Model:
+        def __init__(self, terms, idf, matrix, ids, key = None):
+                self.terms = terms
+                self.vocabulary = {t: i for i, t in enumerate(terms)}
+                self.idf = idf
+                self.matrix = matrix
+                self.ids = ids
+                self.key = key
+
+        def vectorize(self, texts):
+                """Returns the L2 normalized TF-IDF matrix of the texts in the vocabulary of the model."""
+                import numpy as np
+                from scipy.sparse import csr_matrix
+                indptr = [0]
+                indices = list()
+                data = list()
+                vocabulary = self.vocabulary
+                for text in texts:
+                        tf = dict()
+                        for t in tokenize(text):
+                                i = vocabulary.get(t)
+                                if i is not None: tf[i] = tf.get(i, 0) + 1
+                        indices.extend(tf)
+                        data.extend(tf.values())
+                        indptr.append(len(indices))
+                m = csr_matrix((np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)), shape=(len(texts), len(self.terms)))
+                m.data = np.log1p(m.data)
+                m = m.multiply(self.idf).tocsr()
+                norms = np.sqrt(np.asarray(m.multiply(m).sum(axis=1)).ravel())
+                norms[norms == 0] = 1
+                return csr_matrix(m.multiply(1 / norms[:, None]))
+
+        def rank(self, texts, top = 5, block = 10000):
+                """Returns for every text the list of (CWE ID, score) of the best ranked weaknesses."""
+                import numpy as np
+                r = list()
+                top = min(top, len(self.ids))
+                wt = self.matrix.T.tocsc()
+                for start in range(0, len(texts), block):
+                        scores = (self.vectorize(texts[start:start + block]) @ wt).toarray()
+                        best = np.argpartition(-scores, top - 1, axis=1)[:, :top]
+                        best_scores = np.take_along_axis(scores, best, axis=1)
+                        order = np.argsort(-best_scores, axis=1, kind="stable")
+                        best = np.take_along_axis(best, order, axis=1)
+                        best_scores = np.take_along_axis(best_scores, order, axis=1)
+                        for row, row_scores in zip(best, best_scores):
+                                r.append([(self.ids[i], float(s)) for i, s in zip(row, row_scores) if s > 0])
+                return r
+
+        def save(self, fn = model_fn):
+                import numpy as np
+                os.makedirs(os.path.dirname(fn) or ".", exist_ok = True)
+                m = self.matrix
+                np.savez(fn, terms=np.asarray(self.terms), idf=self.idf, data=m.data, indices=m.indices, indptr=m.indptr, shape=np.asarray(m.shape), ids=np.asarray(self.ids), key=np.asarray(self.key or ""))
+
+def fit(documents, key = None):
+        """Fits the model to a dictionary CWE ID -> text."""
+        import numpy as np
+        ids = sorted(documents, key = lambda ID: int(ID[4:]))
+        df = dict()
+        for ID in ids:
+                for t in set(tokenize(documents[ID])):
+                        df[t] = df.get(t, 0) + 1
+        terms = sorted(df)
+        idf = np.log((1 + len(ids)) / (1 + np.asarray([df[t] for t in terms], dtype=np.float32))).astype(np.float32) + 1
+        model = Model(terms, idf, None, ids, key)
+        model.matrix = model.vectorize([documents[ID] for ID in ids])
+        return model
+
+def load(key, fn = model_fn):
+        """Returns the cached model with the key or None."""
+        import numpy as np
+        from scipy.sparse import csr_matrix
+        if not os.path.exists(fn): return None
+        with np.load(fn) as f:
+                if str(f["key"]) != key: return None
+                matrix = csr_matrix((f["data"], f["indices"], f["indptr"]), shape=tuple(f["shape"]))
+                return Model([str(t) for t in f["terms"]], f["idf"], matrix, [str(ID) for ID in f["ids"]], key)
+
+def weaknessDocuments(entries):
+        return {"CWE-" + e.element.attrib["ID"]: uncode(e.element.attrib["Name"]) + "\n" + documentText(e) for e in entries if e.element.tag.endswith("}Weakness")}
+
+def model(xml_fn, fn = model_fn):
+        """Returns the model of the CWE List, fitted and cached when the cache is not current."""
+        import generateCWEontology as generator
+        import snapshot
+        key = snapshot.digest(xml_fn, ())
+        m = load(key, fn)
+        if m is not None: return m
+        print("Fit TF-IDF model")
+        generator.xml_fn = xml_fn
+        m = fit(weaknessDocuments(generator.extractEntries(generator.parseXML())), key)
+        m.save(fn)
+        return m
+
+def readDescriptions(in_file):
+        """Reads lines "CVE ID<tab>description" and returns the lists of IDs and descriptions."""
+        ids = list()
+        texts = list()
+        for line in in_file:
+                line = line.rstrip("\n")
+                if not line: continue
+                ID, _, text = line.partition("\t")
+                ids.append(ID)
+                texts.append(text)
+        return ids, texts
+
+if __name__ == "__main__":
+        import generateCWEontology as generator
+        parser = argparse.ArgumentParser()
+        parser.add_argument('descriptions', nargs='?', help='file of lines "CVE ID<tab>description", standard input by default')
+        parser.add_argument('-n', '--top', type=int, default=5, help='number of candidate CWEs')
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-m', '--model', default=model_fn, help='cached model file')
+        args = parser.parse_args()
+        try:
+                import numpy, scipy
+        except ImportError:
+                sys.exit("The ranking requires NumPy and SciPy.")
+        start = datetime.now()
+        m = model(args.input, args.model)
+        loaded = datetime.now()
+        if args.descriptions is None:
+                ids, texts = readDescriptions(sys.stdin)
+        else:
+                with open(args.descriptions, mode='r', encoding='utf-8') as in_file:
+                        ids, texts = readDescriptions(in_file)
+        ranked = m.rank(texts, args.top)
+        end = datetime.now()
+        for ID, candidates in zip(ids, ranked):
+                print(ID + "\t" + "\t".join(f"{cwe}:{score:.3f}" for cwe, score in candidates))
+        print(f"Loaded: {loaded - start}", file=sys.stderr)
+        print(f"Ranked {len(texts)}: {end - loaded}", file=sys.stderr)
@@ -0,0 +1,101 @@
+"""Validation of the CWE List against the CWE schema.
+
+The whole document is validated with a single schema validation, or every Weakness, Category and View entry is validated independently
+in parallel worker processes. Every entry is wrapped in a catalog of its own and validated against the schema compiled once per worker,
+the remaining catalog (attributes and External_References) is validated in the main process and the entry IDs and names are checked for uniqueness.
+The errors are reported per CWE ID, so the valid entries can still be generated.
+"""
+
+import argparse
+from datetime import datetime
+from multiprocessing import Pool
+
+LS = "{http://cwe.mitre.org/cwe-6}"
+xsd_fn = "data/cwe_schema_latest.xsd"
+containers = {"Weakness":"Weaknesses", "Category":"Categories", "View":"Views"}
+
+_schema = None
+_header = None
+
+def _initWorker(xsd, header):
+        global _schema, _header
+        import lxml.etree
+        _schema = lxml.etree.XMLSchema(file=xsd)
+        _header = lxml.etree.fromstring(header)
+
+def _validateEntry(task):
+        import copy, lxml.etree
+        ID, tag, line, entry = task
+        try:
+                doc = copy.deepcopy(_header)
+                lxml.etree.SubElement(doc, LS + containers[tag]).append(lxml.etree.fromstring(entry))
+                if _schema.validate(doc): return (ID, [])
+                return (ID, [f"line {line + e.line - 1}: {e.message}" for e in _schema.error_log])
+        except Exception as exc:
+                return (ID, [f"line {line}: {exc}"])
+
+def validateDocument(xml_file, xsd = xsd_fn):
+        """Validates the whole parsed document and returns the error log or None if the document is valid."""
+        import lxml.etree
+        xml_validator = lxml.etree.XMLSchema(file=xsd)
+        if xml_validator.validate(xml_file): return None
+        return xml_validator.error_log
+
+def validateEntries(xml_file, xsd = xsd_fn, processes = None):
+        """Validates every entry of the parsed document independently and returns a dictionary CWE ID -> list of errors of the invalid entries.
+        The errors of the catalog outside the entries are reported under the key "Weakness_Catalog"."""
+        import lxml.etree
+        root = xml_file.getroot()
+        header = lxml.etree.tostring(lxml.etree.Element(root.tag, root.attrib, nsmap=root.nsmap))
+        tasks = list()
+        errors = dict()
+        seen = dict()
+        for tag, container in containers.items():
+                c = root.find(LS + container)
+                if c is None: continue
+                for e in c.findall(LS + tag):
+                        ID = e.attrib.get("ID", "")
+                        for k in ("ID", "Name"):
+                                key = (tag, e.attrib.get(k)) if k == "ID" else e.attrib.get(k)
+                                if key in seen:
+                                        errors.setdefault("CWE-" + ID, list()).append(f"line {e.sourceline}: duplicate {k} " + str(e.attrib.get(k)))
+                                seen[key] = ID
+                        tasks.append(("CWE-" + ID, tag, e.sourceline, lxml.etree.tostring(e, with_tail=False)))
+        skeleton = lxml.etree.Element(root.tag, root.attrib, nsmap=root.nsmap)
+        er = root.find(LS + "External_References")
+        if er is not None: skeleton.append(lxml.etree.fromstring(lxml.etree.tostring(er, with_tail=False)))
+        schema = lxml.etree.XMLSchema(file=xsd)
+        if not schema.validate(skeleton):
+                errors["Weakness_Catalog"] = [e.message for e in schema.error_log]
+        with Pool(processes, initializer=_initWorker, initargs=(xsd, header)) as pool:
+                for ID, l in pool.imap_unordered(_validateEntry, tasks, chunksize=32):
+                        if l: errors.setdefault(ID, list()).extend(l)
+        return errors
+
+def printErrors(errors):
+        for ID, l in sorted(errors.items()):
+                print(ID + ":")
+                for e in l:
+                        print("\t" + e)
+
+if __name__ == "__main__":
+        import lxml.etree
+        from generateCWEontology import openCatalog, xml_fn
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=xml_fn, help='CWE List file')
+        parser.add_argument('-w', '--whole', action="store_true", help='validate the whole document with a single validation')
+        parser.add_argument('-p', '--processes', type=int, help='number of worker processes')
+        args = parser.parse_args()
+        start = datetime.now()
+        with openCatalog(args.input) as in_file:
+                xml_file = lxml.etree.parse(in_file)
+        if args.whole:
+                error_log = validateDocument(xml_file)
+                print("CWE List contents is valid." if error_log is None else error_log)
+        else:
+                errors = validateEntries(xml_file, processes=args.processes)
+                if errors:
+                        printErrors(errors)
+                else:
+                        print("CWE List contents is valid.")
+        print(f"Elapsed: {datetime.now() - start}")
@@ -0,0 +1,180 @@
+"""Watch mode of the CWE ontology generator.
+
+The watcher is a long running process that keeps the parsed CWE List, the compiled CWE schema and the rendered entries in memory.
+It polls the CWE List, "shell.ttl" and the schema for changes and regenerates "results/cwe.ttl" with only the affected work:
+a changed schema is compiled again, a changed CWE List is validated and only its changed weaknesses and categories are extracted again
+(the views are always extracted again because their filters depend on the whole list) and a changed shell only rewrites the output.
+A rebuild on demand is triggered over a local socket with "watch.py --trigger".
+"""
+
+import argparse, os, socket, socketserver, threading, time
+import xml.etree.ElementTree as etree
+import generateCWEontology as generator
+from datetime import datetime
+
+port = 8765
+
+class Workspace:
+        def __init__(self, xml_fn = generator.xml_fn, shell_fn = "shell.ttl", xsd_fn = "data/cwe_schema_latest.xsd", fn = "results/cwe.ttl", sections = generator.profiles["full"], validate = True):
+                self.xml_fn = xml_fn
+                self.shell_fn = shell_fn
+                self.xsd_fn = xsd_fn
+                self.fn = fn
+                self.sections = sections
+                self.validate = validate
+                self.mtimes = dict()
+                self.schema = None
+                self.root = None
+                self.references = ""
+                self.rendered = dict()
+                self.entries = list()
+                self.lock = threading.RLock()
+
+        def changed(self):
+                """Returns the set of the watched files modified since the last check."""
+                r = set()
+                for fn in (self.xml_fn, self.shell_fn, self.xsd_fn):
+                        try:
+                                m = os.path.getmtime(fn)
+                        except FileNotFoundError:
+                                continue
+                        if self.mtimes.get(fn) != m:
+                                self.mtimes[fn] = m
+                                r.add(fn)
+                return r
+
+        def compileSchema(self):
+                import lxml.etree
+                print("Compile schema")
+                self.schema = lxml.etree.XMLSchema(file=self.xsd_fn)
+
+        def parse(self):
+                """Parses and validates the CWE List and returns False if it is not valid."""
+                if self.validate:
+                        import lxml.etree
+                        if self.schema is None: self.compileSchema()
+                        with generator.openCatalog(self.xml_fn) as in_file:
+                                xml_file = lxml.etree.parse(in_file)
+                        if not self.schema.validate(xml_file):
+                                print("CWE List contents is not valid!")
+                                print(self.schema.error_log)
+                                return False
+                with generator.openCatalog(self.xml_fn) as in_file:
+                        self.root = etree.parse(in_file).getroot()
+                return True
+
+        def extract(self, cache = None):
+                """Extracts the weaknesses and categories changed against the cache and all views and returns the number of extracted entries."""
+                if cache is None: cache = self.rendered
+                rendered = dict()
+                entries = list()
+                count = 0
+                generate = {generator.LS + "Weakness": generator.generateWeaknessIndividual, generator.LS + "Category": generator.generateCategoryIndividual}
+                for path in ("Weaknesses/" + generator.LS + "Weakness", "Categories/" + generator.LS + "Category"):
+                        for item in self.root.findall(generator.LS + path):
+                                key = (item.tag, item.attrib["ID"])
+                                source = etree.tostring(item)
+                                cached = cache.get(key)
+                                if cached is None or cached[0] != source:
+                                        entry = generate[item.tag](item, sections = self.sections)
+                                        cached = (source, entry, entry.render())
+                                        count += 1
+                                rendered[key] = cached
+                                entries.append(cached[1])
+                for item in self.root.findall(generator.LS + "Views/" + generator.LS + "View"):
+                        entry = generator.generateViewIndividual(item, self.root, sections = self.sections)
+                        rendered[(item.tag, item.attrib["ID"])] = (None, entry, entry.render())
+                        entries.append(entry)
+                        count += 1
+                if "References" in self.sections:
+                        self.references = "".join(i.tostring() for i in generator.generateExternalReferences(self.root))
+                generator.Individual.extend.clear()
+                self.rendered = rendered
+                self.entries = entries
+                return count
+
+        def write(self):
+                os.makedirs(os.path.dirname(self.fn) or ".", exist_ok = True)
+                with open(self.fn, mode='w', encoding='utf-8') as out_file:
+                        generator.generateShell(self.root, out_file, self.shell_fn)
+                        for source, entry, text in self.rendered.values():
+                                out_file.write(text)
+                        out_file.write(self.references)
+
+        def update(self, changed, force = False):
+                """Regenerates the output for the changed files, everything when forced, and returns False if the inputs cannot be used.
+                A CWE List or schema that cannot be read or parsed, e.g. while an editor is saving it, keeps the previous state."""
+                errors = (etree.ParseError, OSError)
+                if self.validate:
+                        import lxml.etree
+                        errors += (lxml.etree.Error,)
+                with self.lock:
+                        start = datetime.now()
+                        try:
+                                if self.xsd_fn in changed and self.validate:
+                                        self.compileSchema()
+                                        changed = changed | {self.xml_fn}
+                                if self.xml_fn in changed or self.root is None or force:
+                                        if not self.parse(): return False
+                                        print(f"Extracted entries: {self.extract(dict() if force else None)}")
+                                self.write()
+                        except errors as exc:
+                                print(f"Generation failed: {exc}")
+                                return False
+                        print(f"Generated {self.fn}: {datetime.now() - start}")
+                        return True
+
+        def rebuild(self):
+                with self.lock:
+                        self.changed()
+                        return self.update({self.xml_fn, self.shell_fn}, force = True)
+
+def serve(workspace, port = port):
+        class Handler(socketserver.StreamRequestHandler):
+                def handle(self):
+                        self.rfile.readline()
+                        start = datetime.now()
+                        ok = workspace.rebuild()
+                        self.wfile.write(((f"Rebuilt: {datetime.now() - start}" if ok else "Rebuild failed, the previous output is kept.") + "\n").encode('UTF-8'))
+
+        server = socketserver.ThreadingTCPServer(("localhost", port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        print(f"Listening for rebuild triggers on localhost:{port}")
+        return server
+
+def trigger(port = port):
+        with socket.create_connection(("localhost", port)) as s:
+                s.sendall(b"rebuild\n")
+                print(s.makefile().readline().rstrip())
+
+def watch(workspace, interval = 1.0, port = port):
+        workspace.changed()
+        workspace.update({workspace.xml_fn, workspace.shell_fn})
+        if port is not None: serve(workspace, port)
+        print("Watching " + ", ".join((workspace.xml_fn, workspace.shell_fn, workspace.xsd_fn)))
+        while True:
+                time.sleep(interval)
+                changed = workspace.changed()
+                if changed:
+                        print("Changed: " + ", ".join(sorted(changed)))
+                        workspace.update(changed)
+
+if __name__ == "__main__":
+        parser = argparse.ArgumentParser()
+        parser.add_argument('-i', '--input', default=generator.xml_fn, help='CWE List file')
+        parser.add_argument('-o', '--output', default="results/cwe.ttl", help='ontology file')
+        parser.add_argument('-n', '--interval', type=float, default=1.0, help='polling interval in seconds')
+        parser.add_argument('-V', '--no-validate', action="store_true", help='do not validate the CWE List')
+        parser.add_argument('-P', '--profile', default="full", choices=["core", "full"], help='output profile: the sections of the entries to generate')
+        parser.add_argument('--port', type=int, default=port, help='local port of the rebuild trigger')
+        parser.add_argument('-t', '--trigger', action="store_true", help='trigger a rebuild of the running watcher and exit')
+        args = parser.parse_args()
+        if args.trigger:
+                trigger(args.port)
+        else:
+                workspace = Workspace(args.input, fn = args.output, sections = generator.profiles[args.profile], validate = not args.no_validate)
+                try:
+                        watch(workspace, args.interval, args.port)
+                except KeyboardInterrupt:
+                        pass